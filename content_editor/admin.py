@@ -12,6 +12,8 @@ from django.utils.text import capfirst
 from django.utils.translation import gettext
 from js_asset import JS, JSON, ImportMap, Media, static_lazy
 
+from content_editor.models import plugin_regions
+
 
 __all__ = ("ContentEditorInline", "ContentEditor", "allow_regions", "deny_regions")
 
@@ -68,6 +70,7 @@ class ContentEditorInlineChecks(InlineModelAdminChecks):
         errors = super().check(inline_obj, **kwargs)
         errors.extend(self.check_content_editor_fields_in_fieldset(inline_obj))
         errors.extend(self.check_content_editor_iterable_regions(inline_obj))
+        errors.extend(self.check_content_editor_allowed_regions(inline_obj))
         return errors
 
     def check_content_editor_fields_in_fieldset(self, obj):
@@ -98,6 +101,29 @@ class ContentEditorInlineChecks(InlineModelAdminChecks):
                 id="content_editor.E003",
             )
 
+    def check_content_editor_allowed_regions(self, obj):
+        if obj.regions is None or getattr(obj.model, "allowed_regions", None) is None:
+            return
+
+        try:
+            all_regions = {region.key for region in obj.parent_model.regions}
+        except (AttributeError, TypeError):
+            # Regions are only known at runtime, e.g. when using a property
+            return
+
+        regions = obj.regions(all_regions) if callable(obj.regions) else obj.regions
+        if isinstance(regions, str) or not hasattr(regions, "__iter__"):
+            return  # Reported by content_editor.E003
+
+        allowed = plugin_regions(obj.model, all_regions)
+        if disallowed := (set(regions) & all_regions) - allowed:
+            yield checks.Error(
+                f"regions contains {sorted(disallowed)!r} which aren't allowed by"
+                f" {obj.model._meta.label}.allowed_regions.",
+                obj=obj.__class__,
+                id="content_editor.E004",
+            )
+
 
 class ContentEditorInline(StackedInline):
     """
@@ -189,19 +215,22 @@ class ContentEditor(RefinedModelAdmin):
 
         plugins = []
         adding_not_allowed = ["_adding_not_allowed"]
+        region_keys = {region.key for region in instance.regions}
 
         for iaf in context.get("inline_admin_formsets", []):
             if not isinstance(iaf.opts, ContentEditorInline):
                 continue
-            regions = (
-                (
-                    iaf.opts.regions({region.key for region in instance.regions})
-                    if callable(iaf.opts.regions)
-                    else iaf.opts.regions
-                )
-                if allow_change and iaf.opts.has_add_permission(request, instance)
-                else adding_not_allowed
-            )
+            if not allow_change or not iaf.opts.has_add_permission(request, instance):
+                regions = adding_not_allowed
+            elif iaf.opts.regions is None:
+                # Fall back to the allowed regions defined on the plugin model
+                regions = plugin_regions(iaf.opts.model, region_keys)
+                if regions is not None and not regions:
+                    regions = adding_not_allowed
+            elif callable(iaf.opts.regions):
+                regions = iaf.opts.regions(region_keys)
+            else:
+                regions = iaf.opts.regions
             button = iaf.opts.button
             if not button and iaf.opts.icon:
                 button = f'<span class="material-icons">{iaf.opts.icon}</span>'
@@ -7,4 +7,12 @@ class ContentEditorConfig(AppConfig):
 
     def ready(self):
         # Import checks to register them with Django's check framework
-        from content_editor import checks  # noqa: F401, PLC0415
+        from content_editor import caching, checks  # noqa: F401, PLC0415
+        from content_editor.models import _plugin_registry  # noqa: PLC0415
+
+        # Invalidating cached contents costs a query and cache writes per
+        # saved plugin, only pay for it when caching is actually used
+        if caching._enabled():
+            caching.connect_signals()
+        # Build the plugin registry now instead of during the first request
+        _plugin_registry()
@@ -0,0 +1,242 @@
+import hashlib
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from content_editor.contents import (
+    _plugin_class,
+    contents_for_item,
+    contents_for_items,
+)
+from content_editor.models import PluginBase, registered_plugins
+
+
+__all__ = (
+    "cached_contents_for_items",
+    "cached_contents_for_item",
+    "invalidate_contents",
+)
+
+
+def _cache():
+    return caches[getattr(settings, "CONTENT_EDITOR_CACHE", "default")]
+
+
+def _enabled():
+    return getattr(settings, "CONTENT_EDITOR_CACHING", False)
+
+
+def _check_enabled():
+    # Without the signal handlers cache entries would never be invalidated
+    if not _enabled():
+        raise ImproperlyConfigured(
+            "Caching contents requires the CONTENT_EDITOR_CACHING setting."
+        )
+
+
+def _version_key(model, pk):
+    # Proxy models share the versions of their concrete model
+    label = _plugin_class(model)._meta.concrete_model._meta.label_lower
+    return f"content-editor:version:{label}:{pk}"
+
+
+def _version_timeout(timeout=None):
+    # Versions should outlive the entries using them. They expire eventually
+    # nevertheless because one key is created per item and plugin.
+    default = getattr(settings, "CONTENT_EDITOR_VERSION_TIMEOUT", 30 * 86400)
+    if isinstance(timeout, int | float) and timeout > 0:
+        return max(default, 2 * timeout)
+    return default
+
+
+def _versions(cache, items, timeout=None):
+    keys = {item: _version_key(item.__class__, item.pk) for item in items}
+    versions = cache.get_many(keys.values())
+    if missing := set(keys.values()) - set(versions):
+        # Start with a timestamp instead of 1 so that evicted version keys
+        # never resurrect outdated cache entries. Overwriting a version set
+        # concurrently only causes cache misses, never stale entries.
+        initial = dict.fromkeys(missing, time.time_ns())
+        cache.set_many(initial, _version_timeout(timeout))
+        versions.update(initial)
+    return {item: versions[key] for item, key in keys.items()}
+
+
+def _projection_key(projection):
+    # Contents loaded using only() or defer() must not be shared with contents
+    # of the full instances
+    return ";".join(
+        sorted(
+            f"{plugin._meta.label_lower}:{','.join(sorted(fields))}"
+            for plugin, fields in (projection or {}).items()
+        )
+    )
+
+
+def _contents_key(
+    item, plugins, regions, versions, *, only=None, defer=None, records=False
+):
+    if plugins is None:
+        plugins = registered_plugins(item.__class__)
+    parts = [
+        ",".join(plugin._meta.label_lower for plugin in plugins),
+        ",".join(region.key for region in regions or item.regions),
+        _projection_key(only),
+        _projection_key(defer),
+        "records" if records else "",
+        *(f"{_version_key(other.__class__, other.pk)}:{v}" for other, v in versions),
+    ]
+    digest = hashlib.md5("|".join(parts).encode(), usedforsecurity=False)
+    return f"content-editor:contents:{digest.hexdigest()}"
+
+
+def invalidate_contents(item):
+    """
+    Invalidate all cached contents of ``item``
+
+    This happens automatically when plugins are saved or deleted, but has to
+    be done by hand when using ``QuerySet.update()`` or ``bulk_create()``.
+    """
+    _bump_version(item.__class__, item.pk)
+
+
+def _bump_version(model, pk):
+    cache = _cache()
+    key = _version_key(model, pk)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), _version_timeout())
+
+
+def _plugin_saving(sender, instance, **kwargs):
+    # Remember the previous parent so that moving a plugin to another parent
+    # also invalidates the contents of the parent it was moved away from.
+    if kwargs.get("raw") or instance._state.adding or instance.pk is None:
+        return
+    instance._content_editor_previous_parent_id = (
+        sender._base_manager.using(instance._state.db)
+        .filter(pk=instance.pk)
+        .values_list("parent_id", flat=True)
+        .first()
+    )
+
+
+def _plugin_changed(sender, instance, **kwargs):
+    # Invalidates rendered fragments of the plugin, see content_editor.renderer
+    _bump_version(sender, instance.pk)
+    parent = sender._meta.get_field("parent").related_model
+    previous = instance.__dict__.pop("_content_editor_previous_parent_id", None)
+    for parent_id in {instance.parent_id, previous} - {None}:
+        _bump_version(parent, parent_id)
+
+
+def cached_contents_for_items(
+    items,
+    plugins=None,
+    *,
+    regions=None,
+    only=None,
+    defer=None,
+    records=False,
+    timeout=DEFAULT_TIMEOUT,
+    **kwargs,
+):
+    """
+    Cached version of ``contents_for_items``
+
+    Only items whose contents aren't cached yet are passed on to
+    ``contents_for_items``.
+    """
+    _check_enabled()
+    cache = _cache()
+    plugins = None if plugins is None else list(plugins)
+    versions = _versions(cache, items, timeout)
+    keys = {
+        item: _contents_key(
+            item,
+            plugins,
+            regions,
+            [(item, version)],
+            only=only,
+            defer=defer,
+            records=records,
+        )
+        for item, version in versions.items()
+    }
+    cached = cache.get_many(keys.values())
+    contents = {item: cached.get(key) for item, key in keys.items()}
+    if missing := [item for item, value in contents.items() if value is None]:
+        fetched = contents_for_items(
+            missing,
+            plugins,
+            regions=regions,
+            only=only,
+            defer=defer,
+            records=records,
+            **kwargs,
+        )
+        cache.set_many({keys[item]: value for item, value in fetched.items()}, timeout)
+        contents.update(fetched)
+    return contents
+
+
+def cached_contents_for_item(
+    item,
+    plugins=None,
+    *,
+    inherit_from=None,
+    regions=None,
+    only=None,
+    defer=None,
+    records=False,
+    timeout=DEFAULT_TIMEOUT,
+    **kwargs,
+):
+    """
+    Cached version of ``contents_for_item``
+
+    The cache entry is invalidated when plugins of ``item`` or of any instance
+    in ``inherit_from`` change.
+    """
+    _check_enabled()
+    cache = _cache()
+    plugins = None if plugins is None else list(plugins)
+    inherit_from = list(inherit_from) if inherit_from else []
+    versions = _versions(cache, [item, *inherit_from], timeout)
+    key = _contents_key(
+        item,
+        plugins,
+        regions,
+        versions.items(),
+        only=only,
+        defer=defer,
+        records=records,
+    )
+    contents = cache.get(key)
+    if contents is None:
+        contents = contents_for_item(
+            item,
+            plugins,
+            inherit_from=inherit_from,
+            regions=regions,
+            only=only,
+            defer=defer,
+            records=records,
+            **kwargs,
+        )
+        cache.set(key, contents, timeout)
+    return contents
+
+
+def connect_signals():
+    for model in apps.get_models():
+        if issubclass(model, PluginBase):
+            pre_save.connect(_plugin_saving, sender=model)
+            post_save.connect(_plugin_changed, sender=model)
+            post_delete.connect(_plugin_changed, sender=model)
@@ -1,80 +1,844 @@
-from itertools import chain
-from operator import attrgetter
+import heapq
+import threading
+from bisect import insort
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, partial
+from itertools import chain, islice
+from operator import attrgetter, itemgetter
+from time import perf_counter
+from types import MappingProxyType
 
+from django.apps import apps
+from django.conf import settings
+from django.db import connections
+from django.db.models import Model, Prefetch, QuerySet, Value
+from django.db.models.base import ModelState
+from django.db.models.query import ValuesListIterable
 
-__all__ = ("Contents", "contents_for_items", "contents_for_item")
+from content_editor.instrumentation import (
+    _current_call,
+    _instrument,
+    _measure,
+    _record_query,
+)
+from content_editor.models import plugin_regions, registered_plugins
+
+
+__all__ = (
+    "Contents",
+    "LazyContents",
+    "FrozenContents",
+    "contents_for_items",
+    "contents_for_item",
+    "contents_for_tree",
+    "iter_contents_for_items",
+    "PrefetchContents",
+    "acontents_for_items",
+    "acontents_for_item",
+)
+
+
+_ordering = attrgetter("ordering")
 
 
 class Contents:
+    __slots__ = (
+        "regions",
+        "_region_index",
+        "_accessed",
+        "_unsorted",
+        "_contents",
+        "_unknown_region_contents",
+    )
+
     def __init__(self, regions):
         self.regions = regions
-        self._sorted = False
-        self._contents = {region.key: [] for region in self.regions}
+        self._region_index = {region.key: region for region in regions}
+        self._accessed = False
+        self._unsorted = set()
+        self._contents = {key: [] for key in self._region_index}
         self._unknown_region_contents = []
 
     def add(self, content):
-        self._sorted = False
         try:
-            self._contents[content.region].append(content)
+            region = self._contents[content.region]
         except KeyError:
             self._unknown_region_contents.append(content)
+            return
+
+        if not region or region[-1].ordering <= content.ordering:
+            region.append(content)
+        elif self._accessed and content.region not in self._unsorted:
+            # Keep regions which have already been read sorted
+            insort(region, content, key=_ordering)
+        else:
+            # Sort regions lazily while loading
+            region.append(content)
+            self._unsorted.add(content.region)
 
-    def _sort(self):
-        for region_key in list(self._contents):
+    def _sort(self, region_keys):
+        for region_key in region_keys:
             self._contents[region_key] = sorted(
-                self._contents[region_key], key=attrgetter("ordering")
+                self._contents[region_key], key=_ordering
             )
-        self._sorted = True
+        self._unsorted.difference_update(region_keys)
 
     def __getattr__(self, key):
         if key.startswith("_"):
             raise AttributeError(f"Invalid region key {key!r} on {self!r}")
-        if not self._sorted:
-            self._sort()
+        self._accessed = True
+        if key in self._unsorted:
+            self._sort([key])
         return self._contents.get(key, [])
 
     def __getitem__(self, key):
         if key.startswith("_"):
             raise KeyError(f"Invalid region key {key!r} on {self!r}")
-        if not self._sorted:
-            self._sort()
+        self._accessed = True
+        if key in self._unsorted:
+            self._sort([key])
         return self._contents.get(key, [])
 
     def __iter__(self):
-        if not self._sorted:
-            self._sort()
-        return chain.from_iterable(
-            self._contents[region.key] for region in self.regions
-        )
+        self._accessed = True
+        if self._unsorted:
+            self._sort(list(self._unsorted))
+        # Contents are stored in the order of regions
+        return chain.from_iterable(self._contents.values())
 
     def __len__(self):
         return sum((len(contents) for contents in self._contents.values()), 0)
 
     def inherit_regions(self, contents):
-        for region in self.regions:
-            if not region.inherited or self[region.key]:
+        for key, region in self._region_index.items():
+            if not region.inherited or self[key]:
                 continue
-            self._contents[region.key] = contents[region.key]  # Still sorted
+            region_contents = contents[key]  # Still sorted
+            # Regions of FrozenContents snapshots are tuples, copy them so that
+            # plugins can still be added to this instance.
+            self._contents[key] = (
+                list(region_contents)
+                if isinstance(region_contents, tuple)
+                else region_contents
+            )
 
+    def freeze(self):
+        """
+        Return an immutable and sorted ``FrozenContents`` snapshot
+        """
+        return FrozenContents(
+            self.regions,
+            {
+                key: tuple(sorted(contents, key=_ordering))
+                if key in self._unsorted
+                else tuple(contents)
+                for key, contents in self._contents.items()
+            },
+            tuple(self._unknown_region_contents),
+        )
 
-def contents_for_items(items, plugins, *, regions=None):
-    contents = {item: Contents(regions or item.regions) for item in items}
-    items_dict = {item.pk: item for item in contents}
+    def _add_sorted(self, region, contents):
+        # Only used when building fresh instances from sorted runs
+        if region in self._contents:
+            self._contents[region].extend(contents)
+        else:
+            self._unknown_region_contents.extend(contents)
+
+    def __getstate__(self):
+        # Plugins are stored as (model, parent, values) records referencing
+        # shared tables of models and parents instead of pickling each
+        # instance including its _state and its parent.
+        models, parents = {}, {}
+
+        def serialize(obj):
+            if not isinstance(obj, Model):
+                return (None, None, obj)
+            attnames = tuple(
+                field.attname
+                for field in obj._meta.concrete_fields
+                if field.attname in obj.__dict__
+            )
+            model = models.setdefault(
+                (obj._meta.label, obj._state.db, attnames), len(models)
+            )
+            fields_cache = dict(obj._state.fields_cache)
+            parent = fields_cache.pop("parent", None)
+            if parent is not None:
+                parent = parents.setdefault(id(parent), (len(parents), parent))[0]
+            record = (model, parent, tuple(obj.__dict__[name] for name in attnames))
+            # Annotations, prefetched objects and related objects other than
+            # the parent are only stored when an instance actually has them
+            extra = {
+                name: value
+                for name, value in obj.__dict__.items()
+                if name != "_state" and name not in attnames
+            }
+            if extra or fields_cache:
+                record += (extra, fields_cache)
+            return record
+
+        return {
+            "regions": self.regions,
+            "unsorted": self._unsorted,
+            "contents": {
+                key: [serialize(obj) for obj in contents]
+                for key, contents in self._contents.items()
+            },
+            "unknown": [serialize(obj) for obj in self._unknown_region_contents],
+            "models": list(models),
+            "parents": [parent for _index, parent in parents.values()],
+        }
+
+    def __setstate__(self, state):
+        models = [
+            (apps.get_model(label), db, attnames)
+            for label, db, attnames in state["models"]
+        ]
+        parents = state["parents"]
+
+        def deserialize(record):
+            model, parent, values, *extra = record
+            if model is None:
+                return values
+            cls, db, attnames = models[model]
+            # Equivalent to Model.from_db() without running __init__ and
+            # the pre_init/post_init signals, like unpickling instances.
+            obj = cls.__new__(cls)
+            obj.__dict__.update(zip(attnames, values))
+            obj._state = ModelState()
+            obj._state.adding = False
+            obj._state.db = db
+            if extra:
+                attributes, fields_cache = extra
+                obj.__dict__.update(attributes)
+                obj._state.fields_cache.update(fields_cache)
+            if parent is not None:
+                obj._state.fields_cache["parent"] = parents[parent]
+            return obj
+
+        self.regions = state["regions"]
+        self._region_index = {region.key: region for region in self.regions}
+        self._accessed = False
+        self._unsorted = state["unsorted"]
+        self._contents = {
+            key: [deserialize(record) for record in records]
+            for key, records in state["contents"].items()
+        }
+        self._unknown_region_contents = [
+            deserialize(record) for record in state["unknown"]
+        ]
+
+
+class LazyContents(Contents):
+    """
+    ``Contents`` variant which only loads plugins when they are accessed
+
+    Accessing a region only queries the plugins of this region, iterating
+    or determining the length loads all remaining plugins at once.
+    """
+
+    __slots__ = ("_item", "_plugins", "_loaded")
+
+    def __init__(self, item, plugins=None, *, regions=None):
+        super().__init__(regions or item.regions)
+        self._item = item
+        self._plugins = _list(plugins)
+        self._loaded = set()
+
+    def _load(self, key):
+        if self._loaded is None or key in self._loaded or key not in self._contents:
+            return
+        self._loaded.add(key)
+        regions = [self._region_index[key]]
+        for queryset in _plugin_querysets(
+            {self._item.pk: self._item}, self._plugins, regions
+        ).values():
+            for obj in queryset:
+                self.add(obj)
+
+    def _load_all(self):
+        if self._loaded is None:
+            return
+        if regions := [
+            region for region in self.regions if region.key not in self._loaded
+        ]:
+            for queryset in _plugin_querysets(
+                {self._item.pk: self._item}, self._plugins, regions
+            ).values():
+                for obj in queryset:
+                    self.add(obj)
+        self._loaded = None
+
+    def __getattr__(self, key):
+        if not key.startswith("_"):
+            self._load(key)
+        return super().__getattr__(key)
+
+    def __getitem__(self, key):
+        if not key.startswith("_"):
+            self._load(key)
+        return super().__getitem__(key)
+
+    def __iter__(self):
+        self._load_all()
+        return super().__iter__()
+
+    def __len__(self):
+        self._load_all()
+        return super().__len__()
+
+    def __getstate__(self):
+        self._load_all()
+        return super().__getstate__()
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self._item = None
+        self._plugins = []
+        self._loaded = None
+
+    def freeze(self):
+        self._load_all()
+        return super().freeze()
+
+
+class FrozenContents:
+    """
+    Immutable snapshot of a ``Contents`` instance returned by
+    ``Contents.freeze()``
+
+    Regions are sorted tuples, snapshots may be shared between threads.
+    """
+
+    __slots__ = ("regions", "_region_index", "_contents", "_unknown_region_contents")
+
+    def __init__(self, regions, contents, unknown_region_contents=()):
+        object.__setattr__(self, "regions", regions)
+        object.__setattr__(
+            self,
+            "_region_index",
+            MappingProxyType({region.key: region for region in regions}),
+        )
+        object.__setattr__(self, "_contents", MappingProxyType(contents))
+        object.__setattr__(self, "_unknown_region_contents", unknown_region_contents)
+
+    def __setattr__(self, attr, value):
+        raise AttributeError("FrozenContents instances are immutable")
+
+    def __delattr__(self, attr):
+        raise AttributeError("FrozenContents instances are immutable")
+
+    def __getattr__(self, key):
+        if key.startswith("_"):
+            raise AttributeError(f"Invalid region key {key!r} on {self!r}")
+        return self._contents.get(key, ())
+
+    def __getitem__(self, key):
+        if key.startswith("_"):
+            raise KeyError(f"Invalid region key {key!r} on {self!r}")
+        return self._contents.get(key, ())
+
+    def __iter__(self):
+        return chain.from_iterable(self._contents.values())
+
+    def __len__(self):
+        return sum((len(contents) for contents in self._contents.values()), 0)
+
+    def inherit(self, contents):
+        """
+        Return a new snapshot using the regions of ``contents``, another
+        snapshot, for inherited regions which are empty in this snapshot
+
+        The tuples are shared between snapshots, not copied.
+        """
+        return FrozenContents(
+            self.regions,
+            {
+                key: contents[key]
+                if not region_contents and self._region_index[key].inherited
+                else region_contents
+                for key, region_contents in self._contents.items()
+            },
+            self._unknown_region_contents,
+        )
+
+    def __reduce__(self):
+        # Reuse the compact pickle representation of Contents
+        contents = Contents(self.regions)
+        contents._contents = {key: list(value) for key, value in self._contents.items()}
+        contents._unknown_region_contents = list(self._unknown_region_contents)
+        return (Contents.freeze, (contents,))
+
+
+def _record(label, fields, values):
+    return _record_class(apps.get_model(label), fields)._make(values)
+
+
+@cache
+def _record_class(plugin, fields):
+    attributes = {
+        "__slots__": (),
+        "plugin": plugin,
+        "__reduce__": lambda self: (
+            _record,
+            (plugin._meta.label, fields, tuple(self)),
+        ),
+    }
+    if "pk" not in fields:
+        attributes["pk"] = property(itemgetter(fields.index(plugin._meta.pk.attname)))
+    return type(
+        f"{plugin.__name__}Record",
+        (namedtuple(f"{plugin.__name__}Record", fields),),
+        attributes,
+    )
+
+
+def _plugin_class(cls):
+    # Records carry the plugin class they were fetched from
+    return cls.plugin if issubclass(cls, tuple) and hasattr(cls, "plugin") else cls
+
+
+class _RecordIterable(ValuesListIterable):
+    def __iter__(self):
+        record = _record_class(self.queryset.model, tuple(self.queryset._fields))
+        return map(record._make, super().__iter__())
+
+
+def _record_fields(plugin, only=None, defer=None):
+    fields = [field.attname for field in plugin._meta.concrete_fields]
+    if only and plugin in only:
+        names = {plugin._meta.get_field(name).attname for name in only[plugin]}
+        names |= {plugin._meta.pk.attname, "parent_id", "region", "ordering"}
+        fields = [name for name in fields if name in names]
+    if defer and plugin in defer:
+        names = {plugin._meta.get_field(name).attname for name in defer[plugin]}
+        fields = [name for name in fields if name not in names]
+    return fields
+
+
+def _plugin_queryset(
+    plugin, *, items_dict, ordering=None, only=None, defer=None, records=False
+):
+    queryset = plugin.get_queryset()
+    if ordering is not None:
+        queryset = queryset.order_by(*ordering)
+    if records:
+        # Records are namedtuples carrying the plugin class instead of model
+        # instances.
+        queryset = queryset.values_list(*_record_fields(plugin, only, defer))
+        queryset._iterable_class = _RecordIterable
+        return queryset
+    if only and plugin in only:
+        queryset = queryset.only("parent", "region", "ordering", *only[plugin])
+    if defer and plugin in defer:
+        queryset = queryset.defer(*defer[plugin])
+    queryset._known_related_objects.setdefault(
+        plugin._meta.get_field("parent"), {}
+    ).update(items_dict)
+    return queryset
+
+
+def _fetch_serial(querysets, prepare, items_dict, regions):
+    return [_measure(plugin, queryset) for plugin, queryset in querysets.items()]
+
+
+def _fetch_union(querysets, prepare, items_dict, regions):
+    # UNION ALL requires all querysets to hit the same database. A single
+    # plugin doesn't profit from the skeleton query.
+    if len(querysets) < 2 or len({qs.db for qs in querysets.values()}) > 1:
+        return _fetch_serial(querysets, prepare, items_dict, regions)
+
+    plugins = list(querysets)
+    skeleton = [
+        queryset.order_by()
+        .annotate(content_editor_plugin=Value(index))
+        .values_list("content_editor_plugin", "pk")
+        for index, queryset in enumerate(querysets.values())
+    ]
+    pks = defaultdict(list)
+    start = perf_counter()
+    for index, pk in skeleton[0].union(*skeleton[1:], all=True):
+        pks[index].append(pk)
+    _record_query(None, sum(map(len, pks.values())), perf_counter() - start)
+    return [
+        _measure(plugins[index], prepare(plugins[index]).filter(pk__in=pks[index]))
+        for index in sorted(pks)
+    ]
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor  # noqa: PLW0603
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "CONTENT_EDITOR_MAX_WORKERS", 4),
+                thread_name_prefix="content_editor",
+            )
+        return _executor
+
+
+def _evaluate(queryset):
+    # Runs in a worker thread which uses its own database connection. The
+    # duration is measured here, the waiting time for a worker isn't included.
+    start = perf_counter()
+    try:
+        return list(queryset), perf_counter() - start
+    finally:
+        connections[queryset.db].close_if_unusable_or_obsolete()
+
+
+def _fetch_threads(querysets, prepare, items_dict, regions):
+    # Other connections do not see uncommitted changes of the current
+    # transaction, run the queries serially inside atomic() blocks.
+    if len(querysets) < 2 or any(
+        connections[queryset.db].in_atomic_block for queryset in querysets.values()
+    ):
+        return _fetch_serial(querysets, prepare, items_dict, regions)
+    results = []
+    for plugin, (rows, duration) in zip(
+        querysets, _get_executor().map(_evaluate, querysets.values())
+    ):
+        _record_query(plugin, len(rows), duration)
+        results.append(rows)
+    return results
+
+
+# Strategies are called with the dictionary of plugin querysets, the function
+# preparing plugin querysets, the items dictionary and the regions. They record
+# the queries they run on the instrumented call, if any.
+# content_editor.index adds an "index" strategy when it is installed.
+_STRATEGIES = {
+    "serial": _fetch_serial,
+    "union": _fetch_union,
+    "threads": _fetch_threads,
+}
+
+
+def _list(plugins):
+    return None if plugins is None else list(plugins)
+
+
+def _plugin_querysets(items_dict, plugins, regions, prepare=None, parents=None):
+    if plugins is None:
+        # Default to all plugins registered for the items' models
+        plugins = dict.fromkeys(
+            chain.from_iterable(
+                registered_plugins(model)
+                for model in {item.__class__ for item in items_dict.values()}
+            )
+        )
+    if prepare is None:
+        prepare = partial(_plugin_queryset, items_dict=items_dict)
+    querysets = {}
+    keys = None if regions is None else {region.key for region in regions}
     for plugin in plugins:
-        queryset = plugin.get_queryset().filter(parent__in=contents.keys())
-        if regions is not None:
+        # Skip plugins which can never appear in the requested regions
+        if keys is not None:
+            allowed = plugin_regions(plugin, keys)
+            if allowed is not None and not allowed:
+                continue
+
+        queryset = prepare(plugin).filter(
+            parent__in=items_dict.values() if parents is None else parents
+        )
+        if keys is not None:
             queryset = queryset.filter(region__in=[region.key for region in regions])
-        queryset._known_related_objects.setdefault(
-            plugin._meta.get_field("parent"), {}
-        ).update(items_dict)
+        querysets[plugin] = queryset
+    return querysets
+
+
+_ORDERINGS = {
+    None: None,
+    "database": ("ordering",),
+    "python": (),
+}
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _contents_for_batch(
+    items, plugins, *, regions, fetch, sort, only, defer, records, parents=None
+):
+    contents = {item: Contents(regions or item.regions) for item in items}
+    items_dict = {item.pk: item for item in contents}
+    by_pk = {item.pk: item_contents for item, item_contents in contents.items()}
+    prepare = partial(
+        _plugin_queryset,
+        items_dict=items_dict,
+        ordering=_ORDERINGS[sort],
+        only=only,
+        defer=defer,
+        records=records,
+    )
+    querysets = _plugin_querysets(items_dict, plugins, regions, prepare, parents)
+    results = fetch(querysets, prepare, items_dict, regions)
+    if (call := _current_call.get()) is not None:
+        call.items += len(contents)
+
+    # Look up contents using parent_id; when filtering using a subquery, rows
+    # of parents added after fetching the items have to be skipped.
+    if sort != "database":
+        for queryset in results:
+            for obj in queryset:
+                if (item_contents := by_pk.get(obj.parent_id)) is not None:
+                    item_contents.add(obj)
+        return contents
+
+    # Each plugin queryset is sorted by ordering, merge the sorted runs of
+    # all plugins per item and region instead of sorting them again.
+    runs = defaultdict(list)
+    for queryset in results:
+        plugin_runs = defaultdict(list)
         for obj in queryset:
+            plugin_runs[obj.parent_id, obj.region].append(obj)
+        for key, run in plugin_runs.items():
+            runs[key].append(run)
+    for (pk, region), region_runs in runs.items():
+        if (item_contents := by_pk.get(pk)) is not None:
+            item_contents._add_sorted(
+                region, heapq.merge(*region_runs, key=attrgetter("ordering"))
+            )
+    return contents
+
+
+def _get_fetch(strategy, sort):
+    try:
+        fetch = _STRATEGIES[strategy]
+    except KeyError:
+        raise ValueError(f"Unknown strategy {strategy!r}") from None
+    if sort not in _ORDERINGS:
+        raise ValueError(f"Unknown sort {sort!r}")
+    return fetch
+
+
+def iter_contents_for_items(
+    items,
+    plugins=None,
+    *,
+    regions=None,
+    strategy="serial",
+    sort=None,
+    only=None,
+    defer=None,
+    batch_size=None,
+    records=False,
+):
+    """
+    Yield ``(item, contents)`` tuples, fetching contents for ``batch_size``
+    items at a time
+    """
+    fetch = _get_fetch(strategy, sort)
+    if batch_size is None:
+        batch_size = getattr(settings, "CONTENT_EDITOR_BATCH_SIZE", 1000)
+    if isinstance(items, QuerySet):
+        items = items.iterator(chunk_size=batch_size)
+
+    plugins = _list(plugins)
+    for batch in _batches(items, batch_size):
+        yield from _contents_for_batch(
+            batch,
+            plugins,
+            regions=regions,
+            fetch=fetch,
+            sort=sort,
+            only=only,
+            defer=defer,
+            records=records,
+        ).items()
+
+
+def contents_for_items(
+    items,
+    plugins=None,
+    *,
+    regions=None,
+    strategy="serial",
+    sort=None,
+    only=None,
+    defer=None,
+    batch_size=None,
+    records=False,
+):
+    with _instrument("contents_for_items"):
+        if isinstance(items, QuerySet) and not items.query.is_sliced:
+            # Let the database resolve the parents using a subquery instead of
+            # sending lists of primary keys.
+            return _contents_for_batch(
+                list(items),
+                _list(plugins),
+                regions=regions,
+                fetch=_get_fetch(strategy, sort),
+                sort=sort,
+                only=only,
+                defer=defer,
+                records=records,
+                parents=items.values("pk"),
+            )
+        return dict(
+            iter_contents_for_items(
+                items,
+                plugins,
+                regions=regions,
+                strategy=strategy,
+                sort=sort,
+                only=only,
+                defer=defer,
+                batch_size=batch_size,
+                records=records,
+            )
+        )
+
+
+def contents_for_item(
+    item,
+    plugins=None,
+    *,
+    inherit_from=None,
+    regions=None,
+    strategy="serial",
+    sort=None,
+    only=None,
+    defer=None,
+    short_circuit=False,
+    records=False,
+):
+    plugins = _list(plugins)
+    fetch = partial(
+        contents_for_items,
+        plugins=plugins,
+        strategy=strategy,
+        sort=sort,
+        only=only,
+        defer=defer,
+        records=records,
+    )
+    with _instrument("contents_for_item") as call:
+        if short_circuit:
+            return _inherit_short_circuit(item, inherit_from, regions, fetch)
+
+        inherit_from = list(inherit_from) if inherit_from else []
+        if call is not None:
+            call.inheritance_depth = len(inherit_from)
+        all_contents = fetch([item] + inherit_from, regions=regions)
+        contents = all_contents[item]
+        for other in inherit_from:
+            contents.inherit_regions(all_contents[other])
+        return contents
+
+
+def _inherit_short_circuit(item, inherit_from, regions, fetch):
+    # Load the item first and only load the still empty inherited regions of
+    # ancestors, stopping as soon as all of them contain plugins.
+    contents = fetch([item], regions=regions)[item]
+    missing = [
+        region
+        for region in contents.regions
+        if region.inherited and not contents[region.key]
+    ]
+    for other in inherit_from or ():
+        if not missing:
+            break
+        contents.inherit_regions(fetch([other], regions=missing)[other])
+        missing = [region for region in missing if not contents[region.key]]
+        if (call := _current_call.get()) is not None:
+            call.inheritance_depth += 1
+    return contents
+
+
+def contents_for_tree(nodes, plugins=None, *, parent=attrgetter("parent_id"), **kwargs):
+    """
+    Return a dictionary mapping all ``nodes`` to their contents with inherited
+    regions resolved
+
+    ``parent`` returns the primary key of a node's parent. Plugins of each node
+    are only fetched once, inherited regions are resolved top-down in memory.
+    Parents which aren't part of ``nodes`` are ignored. All other keyword
+    arguments are passed on to ``contents_for_items``.
+    """
+    all_contents = contents_for_items(nodes, plugins, **kwargs)
+    by_pk = {node.pk: node for node in all_contents}
+    resolved = set()
+    for node in all_contents:
+        # Walk up until reaching a resolved node or a root, then resolve the
+        # path top-down. Inherited lists are shared, not copied.
+        path, ancestor = [], node
+        while ancestor is not None and ancestor.pk not in resolved:
+            resolved.add(ancestor.pk)
+            path.append(ancestor)
+            ancestor = by_pk.get(parent(ancestor))
+        for child in reversed(path):
+            if ancestor is not None:
+                all_contents[child].inherit_regions(all_contents[ancestor])
+            ancestor = child
+    return all_contents
+
+
+class PrefetchContents(Prefetch):
+    """
+    Attach ``Contents`` instances to the instances of a queryset::
+
+        Article.objects.prefetch_related(PrefetchContents([RichText, Download]))
+
+    Accepts the same keyword arguments as ``contents_for_items``.
+    """
+
+    def __init__(self, plugins=None, *, to_attr="contents", **kwargs):
+        super().__init__("_content_editor_contents", to_attr=to_attr)
+        self.plugins = _list(plugins)
+        self.kwargs = kwargs
+
+    def get_current_querysets(self, level):
+        return [self]
+
+    # Django < 5.0
+    def get_current_queryset(self, level):
+        return self
+
+    def prefetch(self, instances):
+        kwargs = {"batch_size": len(instances), **self.kwargs}
+        contents = contents_for_items(instances, self.plugins, **kwargs)
+        pks = {id(item_contents): item.pk for item, item_contents in contents.items()}
+        return (
+            list(contents.values()),
+            lambda item_contents: pks[id(item_contents)],
+            attrgetter("pk"),
+            True,
+            self.to_attr,
+            False,
+        )
+
+
+async def _alist(iterable):
+    if hasattr(iterable, "__aiter__"):
+        return [obj async for obj in iterable]
+    return list(iterable)
+
+
+async def acontents_for_items(items, plugins=None, *, regions=None):
+    contents = {item: Contents(regions or item.regions) for item in await _alist(items)}
+    items_dict = {item.pk: item for item in contents}
+    querysets = _plugin_querysets(items_dict, plugins, regions)
+
+    # Django runs the queries of async iteration one after another in a
+    # single thread, gathering them wouldn't make them run concurrently.
+    for queryset in querysets.values():
+        for obj in await _alist(queryset):
             contents[obj.parent].add(obj)
     return contents
 
 
-def contents_for_item(item, plugins, *, inherit_from=None, regions=None):
-    inherit_from = list(inherit_from) if inherit_from else []
-    all_contents = contents_for_items(
+async def acontents_for_item(item, plugins=None, *, inherit_from=None, regions=None):
+    inherit_from = await _alist(inherit_from) if inherit_from else []
+    all_contents = await acontents_for_items(
         [item] + inherit_from, plugins=plugins, regions=regions
     )
     contents = all_contents[item]
@@ -0,0 +1,19 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class ContentIndexConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    label = "content_editor_index"
+    name = "content_editor.index"
+    verbose_name = _("content index")
+
+    def ready(self):
+        from content_editor import contents  # noqa: PLC0415
+        from content_editor.index.models import (  # noqa: PLC0415
+            connect_signals,
+            fetch_index,
+        )
+
+        connect_signals()
+        contents._STRATEGIES["index"] = fetch_index
@@ -0,0 +1,38 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from content_editor.index.models import rebuild_index
+from content_editor.models import PluginBase
+
+
+class Command(BaseCommand):
+    help = "Rebuild the content index of all or of the given plugin models."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models",
+            nargs="*",
+            metavar="app_label.ModelName",
+            help="Only rebuild the index of the given plugin models.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options["models"]:
+            try:
+                plugins = [apps.get_model(label) for label in options["models"]]
+            except (LookupError, ValueError) as exc:
+                raise CommandError(str(exc)) from exc
+        else:
+            plugins = [
+                model
+                for model in apps.get_models()
+                if issubclass(model, PluginBase) and not model._meta.proxy
+            ]
+
+        for plugin in plugins:
+            if not issubclass(plugin, PluginBase):
+                raise CommandError(f"{plugin._meta.label} is no plugin model.")
+
+        count = rebuild_index(plugins, batch_size=options["batch_size"])
+        self.stdout.write(f"Indexed {count} plugins of {len(plugins)} plugin models.")
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContentIndexEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("parent_id", models.CharField(max_length=255)),
+                ("region", models.CharField(max_length=255)),
+                ("ordering", models.IntegerField(default=0)),
+                ("plugin_id", models.CharField(max_length=255)),
+                (
+                    "parent_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+                (
+                    "plugin_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "content index entry",
+                "verbose_name_plural": "content index entries",
+                "indexes": [
+                    models.Index(
+                        fields=["parent_type", "parent_id", "region", "ordering"],
+                        name="content_editor_index_layout",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("plugin_type", "plugin_id"),
+                        name="content_editor_index_unique_plugin",
+                    )
+                ],
+            },
+        ),
+    ]
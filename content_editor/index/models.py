@@ -0,0 +1,170 @@
+from collections import defaultdict
+from time import perf_counter
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils.translation import gettext_lazy as _
+
+from content_editor.instrumentation import _measure, _record_query
+from content_editor.models import PluginBase
+
+
+__all__ = ("ContentIndexEntry", "index_plugin", "unindex_plugin", "rebuild_index")
+
+
+class ContentIndexEntry(models.Model):
+    """
+    One row per plugin instance recording where the plugin is placed
+    """
+
+    parent_type = models.ForeignKey(
+        ContentType, on_delete=models.CASCADE, related_name="+"
+    )
+    parent_id = models.CharField(max_length=255)
+    region = models.CharField(max_length=255)
+    ordering = models.IntegerField(default=0)
+    plugin_type = models.ForeignKey(
+        ContentType, on_delete=models.CASCADE, related_name="+"
+    )
+    plugin_id = models.CharField(max_length=255)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["plugin_type", "plugin_id"],
+                name="content_editor_index_unique_plugin",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["parent_type", "parent_id", "region", "ordering"],
+                name="content_editor_index_layout",
+            )
+        ]
+        verbose_name = _("content index entry")
+        verbose_name_plural = _("content index entries")
+
+    def __str__(self):
+        return f"{self.plugin_type_id}:{self.plugin_id}"
+
+
+def _parent_model(plugin):
+    return plugin._meta.get_field("parent").related_model
+
+
+def _entry(plugin, parent_id, region, ordering, pk):
+    return ContentIndexEntry(
+        parent_type=ContentType.objects.get_for_model(_parent_model(plugin)),
+        parent_id=str(parent_id),
+        region=region,
+        ordering=ordering,
+        plugin_type=ContentType.objects.get_for_model(plugin),
+        plugin_id=str(pk),
+    )
+
+
+def index_plugin(instance):
+    """
+    Add or update the index entry of a plugin instance
+    """
+    entry = _entry(
+        instance.__class__,
+        instance.parent_id,
+        instance.region,
+        instance.ordering,
+        instance.pk,
+    )
+    ContentIndexEntry.objects.update_or_create(
+        plugin_type=entry.plugin_type,
+        plugin_id=entry.plugin_id,
+        defaults={
+            "parent_type": entry.parent_type,
+            "parent_id": entry.parent_id,
+            "region": entry.region,
+            "ordering": entry.ordering,
+        },
+    )
+
+
+def unindex_plugin(instance):
+    """
+    Remove the index entry of a plugin instance
+    """
+    ContentIndexEntry.objects.filter(
+        plugin_type=ContentType.objects.get_for_model(instance.__class__),
+        plugin_id=str(instance.pk),
+    ).delete()
+
+
+def rebuild_index(plugins, *, batch_size=1000):
+    """
+    Replace the index entries of all ``plugins`` with fresh entries and return
+    the number of entries created
+    """
+    count = 0
+    with transaction.atomic():
+        for plugin in plugins:
+            ContentIndexEntry.objects.filter(
+                plugin_type=ContentType.objects.get_for_model(plugin)
+            ).delete()
+            rows = (
+                plugin._base_manager.order_by()
+                .values_list("parent_id", "region", "ordering", "pk")
+                .iterator(chunk_size=batch_size)
+            )
+            count += len(
+                ContentIndexEntry.objects.bulk_create(
+                    (_entry(plugin, *row) for row in rows), batch_size=batch_size
+                )
+            )
+    return count
+
+
+def _plugin_changed(sender, instance, **kwargs):
+    index_plugin(instance)
+
+
+def _plugin_deleted(sender, instance, **kwargs):
+    unindex_plugin(instance)
+
+
+def fetch_index(querysets, prepare, items_dict, regions):
+    # Determine the plugins of all items using one query on the index and only
+    # load the plugin tables which actually occur.
+    if not querysets:
+        return []
+    plugin_types = {
+        ContentType.objects.get_for_model(plugin).pk: plugin for plugin in querysets
+    }
+    entries = ContentIndexEntry.objects.filter(
+        parent_type__in={
+            ContentType.objects.get_for_model(item.__class__)
+            for item in items_dict.values()
+        },
+        parent_id__in=[str(pk) for pk in items_dict],
+        plugin_type__in=plugin_types,
+    )
+    if regions is not None:
+        entries = entries.filter(region__in=[region.key for region in regions])
+
+    pks = defaultdict(list)
+    start = perf_counter()
+    for plugin_type, plugin_id in entries.values_list("plugin_type", "plugin_id"):
+        pks[plugin_types[plugin_type]].append(plugin_id)
+    _record_query(
+        ContentIndexEntry, sum(map(len, pks.values())), perf_counter() - start
+    )
+    return [
+        _measure(plugin, prepare(plugin).filter(pk__in=pks[plugin]))
+        for plugin in querysets
+        if plugin in pks
+    ]
+
+
+def connect_signals():
+    for model in apps.get_models():
+        if issubclass(model, PluginBase):
+            post_save.connect(_plugin_changed, sender=model)
+            post_delete.connect(_plugin_deleted, sender=model)
@@ -0,0 +1,127 @@
+import math
+from collections import namedtuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter
+
+from django.dispatch import Signal
+
+
+__all__ = ("contents_fetched", "ContentsCall", "PluginQuery", "MemoryCollector")
+
+
+#: Sent with a ``call`` argument containing a ``ContentsCall`` instance after
+#: ``contents_for_items`` or ``contents_for_item`` return.
+contents_fetched = Signal()
+
+
+PluginQuery = namedtuple("PluginQuery", "plugin rows duration")
+
+
+@dataclass
+class ContentsCall:
+    """
+    Cost of a single call to one of the contents helpers
+
+    ``queries`` contains a ``PluginQuery(plugin, rows, duration)`` tuple per
+    query, ``plugin`` being the model label of the plugin or of the index
+    entries. ``plugin`` is ``None`` for the ``UNION ALL`` query of the union
+    strategy.
+    """
+
+    function: str
+    items: int = 0
+    inheritance_depth: int = 0
+    duration: float = 0.0
+    queries: list = field(default_factory=list)
+
+    @property
+    def num_queries(self):
+        return len(self.queries)
+
+    @property
+    def rows(self):
+        rows = {}
+        for query in self.queries:
+            rows[query.plugin] = rows.get(query.plugin, 0) + query.rows
+        return rows
+
+
+_current_call = ContextVar("content_editor_call", default=None)
+
+
+def _record_query(model, rows, duration):
+    if (call := _current_call.get()) is not None:
+        call.queries.append(PluginQuery(model and model._meta.label, rows, duration))
+
+
+def _measure(plugin, queryset):
+    # Evaluate the queryset of ``plugin`` right away while a call is being
+    # instrumented, otherwise return it unchanged.
+    if _current_call.get() is None:
+        return queryset
+    start = perf_counter()
+    rows = list(queryset)
+    _record_query(plugin, len(rows), perf_counter() - start)
+    return rows
+
+
+@contextmanager
+def _instrument(function):
+    # Nested helper calls are recorded as a part of the outermost call.
+    call = _current_call.get()
+    if call is not None or not contents_fetched.has_listeners():
+        yield call
+        return
+
+    call = ContentsCall(function)
+    token = _current_call.set(call)
+    start = perf_counter()
+    try:
+        yield call
+    finally:
+        call.duration = perf_counter() - start
+        _current_call.reset(token)
+    contents_fetched.send(sender=ContentsCall, call=call)
+
+
+class MemoryCollector:
+    """
+    Collect ``ContentsCall`` instances in memory while being used as a context
+    manager::
+
+        with MemoryCollector() as collector:
+            ...
+        collector.percentiles("duration")
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def receive(self, sender, call, **kwargs):
+        self.calls.append(call)
+
+    def __enter__(self):
+        contents_fetched.connect(self.receive, weak=False)
+        return self
+
+    def __exit__(self, *args):
+        contents_fetched.disconnect(self.receive)
+
+    def percentiles(self, attr="duration", percentiles=(50, 90, 99), *, function=None):
+        """
+        Return the nearest-rank percentiles of an attribute of all calls or of
+        all calls of the helper named ``function``
+        """
+        values = sorted(
+            getattr(call, attr)
+            for call in self.calls
+            if function is None or call.function == function
+        )
+        if not values:
+            return {}
+        return {
+            percentile: values[max(math.ceil(percentile / 100 * len(values)), 1) - 1]
+            for percentile in percentiles
+        }
@@ -1,13 +1,30 @@
 import warnings
+from collections import defaultdict
+from functools import cache, partial
+from operator import itemgetter
 
+from django.apps import apps
 from django.core.exceptions import ImproperlyConfigured
 from django.db import models
 
 
-__all__ = ("Type", "Region", "Template", "create_plugin_base")
+__all__ = (
+    "Type",
+    "Region",
+    "Template",
+    "create_plugin_base",
+    "plugin_regions",
+    "registered_plugins",
+)
 
 
 class Type(dict):
+    """
+    Dictionary with a required ``key`` whose items are also available as
+    attributes
+    """
+
+    __slots__ = ()
     _REQUIRED = {"key"}
 
     def __init__(self, **kwargs):
@@ -28,9 +45,25 @@ class Type(dict):
         return hash(self.key)
 
 
+def _immutable(self, *args, **kwargs):
+    raise TypeError(f"{self.__class__.__name__} instances are immutable")
+
+
 class Region(Type):
+    """
+    Immutable ``Type`` whose hash is only computed once
+
+    ``key``, ``title`` and ``inherited`` are properties instead of going
+    through ``__getattr__``.
+    """
+
+    __slots__ = ("_hash",)
     _REQUIRED = {"key", "title", "inherited"}
 
+    key = property(itemgetter("key"))
+    title = property(itemgetter("title"))
+    inherited = property(itemgetter("inherited"))
+
     def __init__(self, *, key, **kwargs):
         kwargs.setdefault("inherited", False)
         if key == "regions":
@@ -40,6 +73,21 @@ class Region(Type):
         elif not key.isidentifier():
             raise ImproperlyConfigured(f"Region key {key!r} is no identifier.")
         super().__init__(key=key, **kwargs)
+        object.__setattr__(self, "_hash", hash(key))
+
+    def __hash__(self):
+        return self._hash
+
+    def __setattr__(self, attr, value):
+        raise AttributeError(f"{self.__class__.__name__} instances are immutable")
+
+    __delattr__ = __setattr__
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __reduce__(self):
+        # The default reduction of dict subclasses uses __setitem__
+        return (partial(self.__class__, **self), ())
 
 
 class Template(Type):
@@ -62,6 +110,13 @@ class PluginBase(models.Model):
     It serves as a marker to identify plugin models in system checks.
     """
 
+    #: The regions this plugin may be added to. Accepts the same values as
+    #: ``ContentEditorInline.regions``, e.g. ``allow_regions({"main"})``.
+    allowed_regions = None
+
+    #: The model passed to ``create_plugin_base()``.
+    _content_base = None
+
     class Meta:
         abstract = True
 
@@ -73,6 +128,61 @@ class PluginBase(models.Model):
         return cls.objects.all()
 
 
+def plugin_regions(plugin, regions):
+    """
+    Return the keys of ``regions`` the plugin may appear in according to its
+    ``allowed_regions`` attribute or ``None`` if it isn't restricted
+    """
+    allowed = getattr(plugin, "allowed_regions", None)
+    if allowed is None:
+        return None
+    regions = set(regions)
+    return set(allowed(plugin, regions) if callable(allowed) else allowed) & regions
+
+
+@cache
+def _plugin_registry():
+    registry = defaultdict(list)
+    for model in apps.get_models():
+        if (
+            issubclass(model, PluginBase)
+            and model._content_base is not None
+            and not model._meta.proxy
+        ):
+            registry[model._content_base._meta.concrete_model].append(model)
+    return {content_base: tuple(plugins) for content_base, plugins in registry.items()}
+
+
+def registered_plugins(content_base):
+    """
+    Return all concrete plugin models created using the plugin base of
+    ``content_base`` in model registration order
+
+    The registry is built once when it is used first, i.e. after all apps
+    have been loaded.
+    """
+    return _plugin_registry().get(content_base._meta.concrete_model, ())
+
+
+class ContentsPrefetcher:
+    """
+    Descriptor added to content bases by ``create_plugin_base`` which allows
+    prefetching contents using ``content_editor.contents.PrefetchContents``
+    """
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        raise AttributeError("Use PrefetchContents to prefetch contents.")
+
+    def get_prefetch_querysets(self, instances, querysets=None):
+        return querysets[0].prefetch(instances)
+
+    # Django < 5.0
+    def get_prefetch_queryset(self, instances, queryset=None):
+        return queryset.prefetch(instances)
+
+
 def create_plugin_base(content_base):
     """
     Create and return a base class for plugins
@@ -95,4 +205,9 @@ def create_plugin_base(content_base):
             app_label = content_base._meta.app_label
             ordering = ["ordering"]
 
+    PluginBaseImpl._content_base = content_base
+
+    if not hasattr(content_base, "_content_editor_contents"):
+        content_base._content_editor_contents = ContentsPrefetcher()
+
     return PluginBaseImpl
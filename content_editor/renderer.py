@@ -0,0 +1,194 @@
+import hashlib
+from collections import Counter
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.template.context import BaseContext
+from django.template.loader import get_template
+from django.utils.html import conditional_escape, mark_safe
+
+from content_editor.caching import _cache, _check_enabled, _version_key, _versions
+from content_editor.contents import _plugin_class
+
+
+__all__ = ("PluginRenderer", "CachedRenderer")
+
+
+class PluginRenderer:
+    """
+    Registry of renderers for plugin classes
+
+    Renderers are either callables receiving the plugin and the context or
+    template names. Templates receive the context and the plugin as
+    ``plugin``. Plugin classes without a renderer of their own use the
+    renderer of the nearest base class. Records use the renderer of their
+    plugin class.
+    """
+
+    def __init__(self):
+        self._renderers = {}
+        self._resolved = {}
+        self._templates = {}
+
+    def register(self, plugin, renderer):
+        """
+        Register a callable or a template name for the plugin class ``plugin``
+        """
+        self._renderers[plugin] = renderer
+        self._resolved.clear()
+
+    def _resolve(self, cls):
+        try:
+            return self._resolved[cls]
+        except KeyError:
+            pass
+        for base in _plugin_class(cls).__mro__:
+            if base in self._renderers:
+                renderer = self._renderers[base]
+                break
+        else:
+            raise KeyError(f"No renderer registered for {cls!r}")
+        if isinstance(renderer, str):
+            renderer = self._render_template(renderer)
+        self._resolved[cls] = renderer
+        return renderer
+
+    def _render_template(self, template_name):
+        if (template := self._templates.get(template_name)) is None:
+            template = self._templates[template_name] = get_template(template_name)
+
+        def render(plugin, context):
+            # Template tags pass Context or RequestContext instances
+            request = getattr(context, "request", None)
+            if isinstance(context, BaseContext):
+                context = context.flatten()
+            context = {**(context or {}), "plugin": plugin}
+            return template.render(context, request or context.get("request"))
+
+        return render
+
+    def render_plugin(self, plugin, context=None):
+        return conditional_escape(self._resolve(plugin.__class__)(plugin, context))
+
+    __call__ = render_plugin
+
+    def stream_plugins(self, plugins, context=None):
+        """
+        Yield the rendered HTML of ``plugins`` plugin by plugin
+
+        Output which isn't marked safe is escaped.
+        """
+        for plugin in plugins:
+            yield conditional_escape(self._resolve(plugin.__class__)(plugin, context))
+
+    def stream_contents(self, contents, context=None):
+        """
+        Yield the rendered HTML of all plugins in ``contents`` in region order,
+        e.g. for use with ``StreamingHttpResponse``
+        """
+        return self.stream_plugins(contents, context)
+
+    def render_plugins(self, plugins, context=None):
+        # All fragments have been escaped by stream_plugins
+        return mark_safe("".join(self.stream_plugins(plugins, context)))
+
+    def render_region(self, contents, region, context=None):
+        return self.render_plugins(contents[region], context)
+
+    def render_contents(self, contents, context=None):
+        """
+        Return a dictionary mapping all region keys to their rendered HTML
+        """
+        return {
+            region.key: self.render_region(contents, region.key, context)
+            for region in contents.regions
+        }
+
+
+def _fragment_key(plugin, version, context_key):
+    key = f"{_version_key(plugin.__class__, plugin.pk)}:{version}:{context_key}"
+    digest = hashlib.md5(key.encode(), usedforsecurity=False)
+    return f"content-editor:fragment:{digest.hexdigest()}"
+
+
+def _region_key(region, fragment_keys):
+    digest = hashlib.md5(
+        "|".join([region, *fragment_keys]).encode(), usedforsecurity=False
+    )
+    return f"content-editor:region:{digest.hexdigest()}"
+
+
+class CachedRenderer:
+    """
+    Render plugins using ``render(plugin, context)`` and cache the fragments
+
+    Fragments are keyed by the plugin's model label, primary key, version and
+    ``context_key``. Versions are bumped when plugins are saved or deleted.
+    Rendered regions are cached as well; their cache key is derived from the
+    keys of all their fragments, therefore changing, adding, removing or
+    reordering plugins automatically uses a different entry.
+
+    Use ``context_key`` to distinguish output which depends on the context,
+    e.g. the current language. Fragments which aren't marked safe are
+    escaped. ``stats`` counts cache hits and misses of fragments and regions.
+    """
+
+    def __init__(self, render, *, timeout=DEFAULT_TIMEOUT):
+        _check_enabled()
+        self._render = render
+        self.timeout = timeout
+        self.stats = Counter()
+
+    def _fragment_keys(self, cache, plugins, context_key):
+        versions = _versions(cache, plugins, self.timeout)
+        return [
+            _fragment_key(plugin, versions[plugin], context_key) for plugin in plugins
+        ]
+
+    def _render_fragments(self, cache, plugins, keys, context):
+        cached = cache.get_many(keys)
+        fragments, missing = [], {}
+        for plugin, key in zip(plugins, keys):
+            if key in cached:
+                self.stats["hits"] += 1
+                fragments.append(cached[key])
+            else:
+                self.stats["misses"] += 1
+                # Escape before caching, only the joined region is marked safe
+                html = conditional_escape(self._render(plugin, context))
+                fragments.append(missing.setdefault(key, html))
+        if missing:
+            cache.set_many(missing, self.timeout)
+        return fragments
+
+    def render_plugins(self, plugins, context=None, *, context_key=""):
+        """
+        Return a list of rendered fragments of all ``plugins``
+        """
+        plugins = list(plugins)
+        if not plugins:
+            return []
+        cache = _cache()
+        keys = self._fragment_keys(cache, plugins, context_key)
+        return self._render_fragments(cache, plugins, keys, context)
+
+    def render_plugin(self, plugin, context=None, *, context_key=""):
+        return self.render_plugins([plugin], context, context_key=context_key)[0]
+
+    def render_region(self, contents, region, context=None, *, context_key=""):
+        """
+        Return the concatenated fragments of the region with key ``region``
+        """
+        plugins = list(contents[region])
+        if not plugins:
+            return mark_safe("")
+        cache = _cache()
+        keys = self._fragment_keys(cache, plugins, context_key)
+        region_key = _region_key(region, keys)
+        html = cache.get(region_key)
+        if html is not None:
+            self.stats["region_hits"] += 1
+            return mark_safe(html)
+        self.stats["region_misses"] += 1
+        html = "".join(self._render_fragments(cache, plugins, keys, context))
+        cache.set(region_key, html, self.timeout)
+        return mark_safe(html)
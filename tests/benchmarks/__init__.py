@@ -0,0 +1,43 @@
+"""
+Benchmarks for django-content-editor
+
+Run from the ``tests`` directory, e.g. ``python -m benchmarks.pickling`` or
+``python -m benchmarks`` for the whole suite.
+"""
+
+import os
+import statistics
+import timeit
+
+
+def setup():
+    import django  # noqa: PLC0415
+    from django.core.management import call_command  # noqa: PLC0415
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "testapp.settings")
+    django.setup()
+    call_command("migrate", run_syncdb=True, verbosity=0)
+
+
+def measure(name, func, *, repeat=5, **params):
+    """
+    Run ``func`` ``repeat`` times and return a result dictionary containing
+    the fastest and the median duration in seconds
+    """
+    times = timeit.repeat(func, number=1, repeat=repeat)
+    result = {
+        "name": name,
+        "params": params,
+        "min": min(times),
+        "median": statistics.median(times),
+        "repeat": repeat,
+    }
+    print(
+        f"{name:<32} {format_params(params):<40}"
+        f" {result['median'] * 1000:10.3f} ms (min {result['min'] * 1000:.3f} ms)"
+    )
+    return result
+
+
+def format_params(params):
+    return " ".join(f"{key}={value}" for key, value in params.items())
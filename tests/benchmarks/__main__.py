@@ -0,0 +1,106 @@
+"""
+Run the benchmark suite and write the results as JSON::
+
+    python -m benchmarks --output results.json
+    python -m benchmarks --compare results.json
+
+Results of separate runs are comparable when they were produced on the same
+machine with the same options.
+"""
+
+import argparse
+import json
+import platform
+import sys
+
+from benchmarks import format_params, setup
+
+
+SUITES = ["contents", "queries", "inheritance", "admin", "pickling"]
+
+
+def compare(results, baseline, threshold):
+    """
+    Print the relative change of the median durations and return the number
+    of results which are slower than the baseline by more than ``threshold``
+    or whose payload ``bytes`` grew
+    """
+    previous = {
+        (result["name"], json.dumps(result["params"], sort_keys=True)): result
+        for result in baseline["results"]
+    }
+    regressions = 0
+    for result in results:
+        key = (result["name"], json.dumps(result["params"], sort_keys=True))
+        if key not in previous:
+            continue
+        ratio = result["median"] / previous[key]["median"]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        size = ""
+        if "bytes" in result and "bytes" in previous[key]:
+            # Payload sizes are deterministic, any growth is reported
+            size = f" {result['bytes'] - previous[key]['bytes']:+8d} bytes"
+            if result["bytes"] > previous[key]["bytes"]:
+                size += "  SIZE REGRESSION"
+                regressions += 1
+        print(
+            f"{result['name']:<32} {format_params(result['params']):<40}"
+            f" {(ratio - 1) * 100:+8.1f}%{flag}{size}"
+        )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("suites", nargs="*", help=f"One or more of {SUITES}")
+    parser.add_argument("--quick", action="store_true", help="Use smaller data sets")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Compare the results to this JSON file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative slowdown reported as a regression (default: 0.1)",
+    )
+    args = parser.parse_args(argv)
+    if unknown := set(args.suites) - set(SUITES):
+        parser.error(f"Unknown suites: {', '.join(sorted(unknown))}")
+
+    setup()
+
+    import django  # noqa: PLC0415
+
+    import content_editor  # noqa: PLC0415
+
+    results = []
+    for suite in args.suites or SUITES:
+        module = __import__(f"benchmarks.{suite}", fromlist=["run"])
+        results.extend(module.run(quick=args.quick))
+
+    data = {
+        "meta": {
+            "content_editor": content_editor.__version__,
+            "django": django.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(data, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print()
+        return 1 if compare(results, baseline, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""
+Benchmark the ``ContentEditor`` change form with many inlines.
+"""
+
+from benchmarks import measure, setup
+
+
+def form_data(html):
+    """
+    Return the data the browser would submit for the change form
+    """
+    from bs4 import BeautifulSoup  # noqa: PLC0415
+
+    form = BeautifulSoup(html, "html.parser").find("form", id="article_form")
+    data = {}
+    for field in form.find_all(["input", "textarea", "select"]):
+        name = field.get("name")
+        if not name or "__prefix__" in name:
+            continue
+        if field.name == "textarea":
+            data[name] = field.string or ""
+        elif field.name == "select":
+            option = field.find("option", selected=True)
+            data[name] = option["value"] if option else ""
+        elif field.get("type") in {"checkbox", "radio"}:
+            if field.has_attr("checked"):
+                data[name] = field.get("value", "on")
+        elif field.get("type") not in {"submit", "button", "file"}:
+            data[name] = field.get("value", "")
+    return data
+
+
+def run(*, quick=False):
+    from django.contrib.auth.models import User  # noqa: PLC0415
+    from django.test import Client  # noqa: PLC0415
+    from django.urls import reverse  # noqa: PLC0415
+    from testapp.models import Article, Download, RichText  # noqa: PLC0415
+
+    user, _created = User.objects.get_or_create(
+        username="benchmark", defaults={"is_staff": True, "is_superuser": True}
+    )
+    client = Client()
+    client.force_login(user)
+
+    results = []
+    for inlines in [100] if quick else [100, 300, 500]:
+        article = Article.objects.create(title="Benchmark")
+        RichText.objects.bulk_create(
+            [
+                RichText(
+                    parent=article, region="main", ordering=index, text="<p>Text</p>"
+                )
+                for index in range(0, inlines, 2)
+            ]
+        )
+        Download.objects.bulk_create(
+            [
+                Download(parent=article, region="main", ordering=index, file="file.pdf")
+                for index in range(1, inlines, 2)
+            ]
+        )
+        url = reverse("admin:testapp_article_change", args=(article.pk,))
+        data = form_data(client.get(url).content)
+
+        def get(url=url):
+            assert client.get(url).status_code == 200
+
+        def post(url=url, data=data):
+            assert client.post(url, data).status_code == 302
+
+        results.extend(
+            [
+                measure("admin.change_form.get", get, inlines=inlines),
+                measure("admin.change_form.post", post, inlines=inlines),
+            ]
+        )
+    return results
+
+
+if __name__ == "__main__":
+    setup()
+    run()
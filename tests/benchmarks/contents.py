@@ -0,0 +1,63 @@
+"""
+Benchmark adding, sorting and iterating ``Contents`` instances.
+"""
+
+import random
+
+from benchmarks import measure, setup
+
+
+def run(*, quick=False):
+    from testapp.models import Article, RichText  # noqa: PLC0415
+
+    from content_editor.contents import Contents  # noqa: PLC0415
+
+    # Use the same blocks in all runs
+    random.seed(0)
+    results = []
+    for blocks in [100, 1000] if quick else [100, 1000, 10000]:
+        article = Article(pk=1, title="Benchmark")
+        plugins = [
+            RichText(
+                pk=index,
+                parent=article,
+                region=random.choice(["main", "sidebar"]),
+                ordering=random.randrange(blocks),
+            )
+            for index in range(blocks)
+        ]
+        ordered = sorted(plugins, key=lambda plugin: plugin.ordering)
+
+        def add(plugins=plugins):
+            contents = Contents(Article.regions)
+            for plugin in plugins:
+                contents.add(plugin)
+            return contents
+
+        def add_sorted(ordered=ordered):
+            contents = Contents(Article.regions)
+            for plugin in ordered:
+                contents.add(plugin)
+            return contents
+
+        def sort(add=add):
+            contents = add()
+            contents._sort(list(contents._unsorted))
+
+        def iterate(add=add):
+            list(add())
+
+        results.extend(
+            [
+                measure("contents.add", add, blocks=blocks),
+                measure("contents.add_sorted", add_sorted, blocks=blocks),
+                measure("contents.add_sort", sort, blocks=blocks),
+                measure("contents.add_iter", iterate, blocks=blocks),
+            ]
+        )
+    return results
+
+
+if __name__ == "__main__":
+    setup()
+    run()
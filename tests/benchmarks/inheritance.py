@@ -0,0 +1,50 @@
+"""
+Benchmark ``contents_for_item`` with deep inheritance chains.
+"""
+
+from benchmarks import measure, setup
+
+
+def run(*, quick=False):
+    from testapp.models import Page, PageText  # noqa: PLC0415
+
+    from content_editor.contents import contents_for_item  # noqa: PLC0415
+
+    results = []
+    for depth in [1, 5, 20] if quick else [1, 5, 10, 20, 50]:
+        # Only the root has sidebar contents, all pages have main contents
+        pages = [Page.objects.create(title="root")]
+        for index in range(depth):
+            pages.append(Page.objects.create(title=f"page {index}", parent=pages[-1]))
+        PageText.objects.create(parent=pages[0], region="sidebar", text="Sidebar")
+        PageText.objects.bulk_create(
+            [
+                PageText(parent=page, region="main", ordering=ordering, text="Text")
+                for page in pages
+                for ordering in range(10)
+            ]
+        )
+        page, ancestors = pages[-1], pages[-2::-1]
+
+        for short_circuit in [False, True]:
+            results.append(
+                measure(
+                    "contents_for_item.inherit",
+                    lambda page=page, ancestors=ancestors, short_circuit=short_circuit: (
+                        contents_for_item(
+                            page,
+                            [PageText],
+                            inherit_from=ancestors,
+                            short_circuit=short_circuit,
+                        )
+                    ),
+                    depth=depth,
+                    short_circuit=short_circuit,
+                )
+            )
+    return results
+
+
+if __name__ == "__main__":
+    setup()
+    run()
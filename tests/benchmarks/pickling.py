@@ -0,0 +1,59 @@
+"""
+Compare the compact pickle representation of ``Contents`` with pickling the
+plain attributes including full model instances.
+
+Results contain the payload size in ``bytes`` in addition to the durations.
+"""
+
+import pickle
+
+from benchmarks import measure, setup
+
+
+def run(*, quick=False):
+    from testapp.models import Article, Download, RichText  # noqa: PLC0415
+
+    from content_editor.contents import Contents, contents_for_item  # noqa: PLC0415
+
+    results = []
+    for blocks in [100] if quick else [100, 1000]:
+        article = Article.objects.create(title="Benchmark")
+        RichText.objects.bulk_create(
+            RichText(
+                parent=article,
+                region="main" if ordering % 3 else "sidebar",
+                ordering=ordering,
+                text=f"<p>Text {ordering}</p>",
+            )
+            for ordering in range(1, blocks, 2)
+        )
+        Download.objects.bulk_create(
+            Download(
+                parent=article, region="main", ordering=ordering, file=f"{ordering}.pdf"
+            )
+            for ordering in range(0, blocks, 2)
+        )
+        contents = contents_for_item(article, [RichText, Download])
+
+        plain = {name: getattr(contents, name) for name in Contents.__slots__}
+        for representation, value in [("plain", plain), ("compact", contents)]:
+            payload = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            for name, func in [
+                ("pickle.dumps", lambda value=value: pickle.dumps(value)),
+                ("pickle.loads", lambda payload=payload: pickle.loads(payload)),
+            ]:
+                result = measure(
+                    name,
+                    func,
+                    repeat=20,
+                    blocks=blocks,
+                    representation=representation,
+                )
+                result["bytes"] = len(payload)
+                results.append(result)
+    return results
+
+
+if __name__ == "__main__":
+    setup()
+    run()
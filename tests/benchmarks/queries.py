@@ -0,0 +1,89 @@
+"""
+Benchmark ``contents_for_items`` with many parents and many plugin types.
+
+Additional plugin types are created on the fly, they are not part of the
+testapp.
+"""
+
+from benchmarks import measure, setup
+
+
+def plugin_types(count):
+    from django.apps import apps  # noqa: PLC0415
+    from django.db import connection, models  # noqa: PLC0415
+    from testapp.models import ArticlePlugin  # noqa: PLC0415
+
+    types = []
+    for index in range(count):
+        name = f"BenchmarkPlugin{index}"
+        try:
+            model = apps.get_model("testapp", name)
+        except LookupError:
+            model = type(
+                name,
+                (ArticlePlugin,),
+                {"__module__": "testapp.models", "text": models.TextField()},
+            )
+            with connection.schema_editor() as editor:
+                editor.create_model(model)
+        types.append(model)
+    return types
+
+
+def run(*, quick=False):
+    from testapp.models import Article  # noqa: PLC0415
+
+    from content_editor.contents import contents_for_items  # noqa: PLC0415
+
+    parent_counts = [1, 100, 1000] if quick else [1, 100, 1000, 10000]
+    type_counts = [1, 10] if quick else [1, 10, 30]
+
+    # One plugin per parent and plugin type
+    articles = Article.objects.bulk_create(
+        [Article(title=f"Article {index}") for index in range(max(parent_counts))]
+    )
+    types = plugin_types(max(type_counts))
+    for plugin in types:
+        plugin.objects.bulk_create(
+            [
+                plugin(parent=article, region="main", ordering=10, text="Text")
+                for article in articles
+            ],
+            batch_size=1000,
+        )
+
+    results = []
+    for parents in parent_counts:
+        for count in type_counts:
+            for strategy in ["serial", "union"]:
+                results.append(
+                    measure(
+                        "contents_for_items",
+                        lambda parents=parents, count=count, strategy=strategy: (
+                            contents_for_items(
+                                articles[:parents], types[:count], strategy=strategy
+                            )
+                        ),
+                        repeat=3,
+                        parents=parents,
+                        types=count,
+                        strategy=strategy,
+                    )
+                )
+            results.append(
+                measure(
+                    "contents_for_items.records",
+                    lambda parents=parents, count=count: contents_for_items(
+                        articles[:parents], types[:count], records=True
+                    ),
+                    repeat=3,
+                    parents=parents,
+                    types=count,
+                )
+            )
+    return results
+
+
+if __name__ == "__main__":
+    setup()
+    run()
@@ -18,6 +18,7 @@ from testapp.models import (
     PageText,
     RichText,
     Section,
+    Teaser,
     Thing,
 )
 
@@ -57,6 +58,7 @@ admin.site.register(
     inlines=[
         RichTextInline,
         ContentEditorInline.create(model=Download, regions=deny_regions({"sidebar"})),
+        ContentEditorInline.create(model=Teaser),
         ThingInline,
         SectionInline,
         CloseSectionInline,
@@ -40,6 +40,8 @@ class RichText(AbstractRichText, ArticlePlugin):
 class Download(ArticlePlugin):
     file = models.TextField()  # FileField, but charfield is easier to test.
 
+    allowed_regions = {"main"}
+
     class Meta:
         verbose_name = "download"
         verbose_name_plural = "downloads"
@@ -48,6 +50,16 @@ class Download(ArticlePlugin):
         return self.file
 
 
+class Teaser(ArticlePlugin):
+    text = models.TextField()
+
+    # The inline doesn't define regions, the admin uses this value instead
+    allowed_regions = {"sidebar"}
+
+    def __str__(self):
+        return self.text
+
+
 class Section(ArticlePlugin):
     pass
 
@@ -9,9 +9,11 @@ INSTALLED_APPS = (
     "django.contrib.staticfiles",
     "testapp",
     "content_editor",
+    "content_editor.index",
 )
 STATIC_URL = "/static/"
 SECRET_KEY = "tests"
+CONTENT_EDITOR_CACHING = True
 ROOT_URLCONF = "testapp.urls"
 ALLOWED_HOSTS = ["*"]
 MIDDLEWARE_CLASSES = (
@@ -0,0 +1,171 @@
+import pytest
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from content_editor.caching import (
+    cached_contents_for_item,
+    cached_contents_for_items,
+    invalidate_contents,
+)
+from content_editor.renderer import CachedRenderer
+from testapp.models import Article, Download, Page, PageText, RichText
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_cached_contents_for_item():
+    article = Article.objects.create(title="Test")
+    text = RichText.objects.create(
+        parent=article, region="main", ordering=10, text="Text"
+    )
+    plugins = [RichText, Download]
+
+    with CaptureQueriesContext(connection) as ctx:
+        contents = cached_contents_for_item(article, plugins)
+        assert len(ctx.captured_queries) == 2
+    assert [c.text for c in contents.main] == ["Text"]
+
+    with CaptureQueriesContext(connection) as ctx:
+        contents = cached_contents_for_item(article, plugins)
+        assert len(ctx.captured_queries) == 0
+    assert [c.text for c in contents.main] == ["Text"]
+
+    # Different plugins use a different cache entry
+    with CaptureQueriesContext(connection) as ctx:
+        cached_contents_for_item(article, [RichText])
+        assert len(ctx.captured_queries) == 1
+
+    text.text = "Changed"
+    text.save()
+
+    with CaptureQueriesContext(connection) as ctx:
+        contents = cached_contents_for_item(article, plugins)
+        assert len(ctx.captured_queries) == 2
+    assert [c.text for c in contents.main] == ["Changed"]
+
+    text.delete()
+    assert cached_contents_for_item(article, plugins).main == []
+
+    RichText.objects.create(parent=article, region="main", ordering=10, text="New")
+    assert [c.text for c in cached_contents_for_item(article, plugins).main] == ["New"]
+
+    RichText.objects.filter(parent=article).update(text="Updated")
+    assert [c.text for c in cached_contents_for_item(article, plugins).main] == ["New"]
+    invalidate_contents(article)
+    assert [c.text for c in cached_contents_for_item(article, plugins).main] == [
+        "Updated"
+    ]
+
+
+@pytest.mark.django_db
+def test_cached_inheritance():
+    page = Page.objects.create(title="root")
+    child = page.children.create(title="child")
+    text = page.testapp_pagetext_set.create(region="sidebar", text="page sidebar")
+
+    contents = cached_contents_for_item(child, [PageText], inherit_from=[page])
+    assert [c.text for c in contents.sidebar] == ["page sidebar"]
+
+    # Changing the plugins of an ancestor invalidates the entry
+    text.text = "changed"
+    text.save()
+
+    with CaptureQueriesContext(connection) as ctx:
+        contents = cached_contents_for_item(child, [PageText], inherit_from=[page])
+        assert len(ctx.captured_queries) == 1
+    assert [c.text for c in contents.sidebar] == ["changed"]
+
+
+@pytest.mark.django_db
+def test_cached_contents_for_items():
+    articles = [Article.objects.create(title=f"Article {i}") for i in range(3)]
+    for article in articles:
+        RichText.objects.create(parent=article, region="main", text=article.title)
+
+    with CaptureQueriesContext(connection) as ctx:
+        contents = cached_contents_for_items(articles[:2], [RichText])
+        assert len(ctx.captured_queries) == 1
+    assert [c.main[0].text for c in contents.values()] == ["Article 0", "Article 1"]
+
+    with CaptureQueriesContext(connection) as ctx:
+        contents = cached_contents_for_items(articles, [RichText])
+        # Only the third article has to be fetched
+        assert len(ctx.captured_queries) == 1
+        assert f"IN ({articles[2].pk})" in ctx.captured_queries[0]["sql"]
+    assert [c.main[0].text for c in contents.values()] == [
+        "Article 0",
+        "Article 1",
+        "Article 2",
+    ]
+
+
+@pytest.mark.django_db
+def test_moved_plugin_invalidates_previous_parent():
+    first, second = [Article.objects.create(title=f"Article {i}") for i in range(2)]
+    text = RichText.objects.create(parent=first, region="main", text="Text")
+
+    assert len(cached_contents_for_item(first, [RichText]).main) == 1
+    assert len(cached_contents_for_item(second, [RichText]).main) == 0
+
+    text.parent = second
+    text.save()
+
+    assert len(cached_contents_for_item(first, [RichText]).main) == 0
+    assert len(cached_contents_for_item(second, [RichText]).main) == 1
+
+
+def test_caching_requires_setting(settings):
+    settings.CONTENT_EDITOR_CACHING = False
+    with pytest.raises(ImproperlyConfigured):
+        cached_contents_for_item(Article(pk=1), [RichText])
+    with pytest.raises(ImproperlyConfigured):
+        cached_contents_for_items([Article(pk=1)], [RichText])
+    with pytest.raises(ImproperlyConfigured):
+        CachedRenderer(lambda plugin, context: "")
+
+
+@pytest.mark.django_db
+def test_cached_projections():
+    article = Article.objects.create(title="Test")
+    Download.objects.create(parent=article, region="main", file="a.pdf")
+
+    full = cached_contents_for_item(article, [Download])
+    assert full.main[0].get_deferred_fields() == set()
+
+    # Projections use their own cache entries
+    with CaptureQueriesContext(connection) as ctx:
+        deferred = cached_contents_for_item(
+            article, [Download], defer={Download: ["file"]}
+        )
+        assert len(ctx.captured_queries) == 1
+    assert deferred.main[0].get_deferred_fields() == {"file"}
+
+    only = cached_contents_for_items([article], [Download], only={Download: []})
+    assert only[article].main[0].get_deferred_fields() == {"file"}
+    assert cached_contents_for_item(article, [Download]).main[0].file == "a.pdf"
+
+
+@pytest.mark.django_db
+def test_cached_records():
+    article = Article.objects.create(title="Test")
+    RichText.objects.create(parent=article, region="main", text="Text")
+
+    assert isinstance(cached_contents_for_item(article, [RichText]).main[0], RichText)
+
+    # Records use their own cache entries
+    records = cached_contents_for_item(article, [RichText], records=True)
+    assert not isinstance(records.main[0], RichText)
+    assert records.main[0].text == "Text"
+    records = cached_contents_for_items([article], [RichText], records=True)
+    assert not isinstance(records[article].main[0], RichText)
+
+    contents = cached_contents_for_items([article], [RichText])
+    assert isinstance(contents[article].main[0], RichText)
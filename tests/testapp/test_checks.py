@@ -3,9 +3,9 @@ from django.core import checks
 from django.db import models
 from django.test.utils import isolate_apps
 
-from content_editor.admin import ContentEditor, ContentEditorInline
+from content_editor.admin import ContentEditor, ContentEditorInline, deny_regions
 from content_editor.checks import check_plugin_bases
-from testapp.models import Article, RichText
+from testapp.models import Article, Download, RichText
 
 
 @isolate_apps()
@@ -82,6 +82,40 @@ def test_inline_checks():
     ]
 
 
+def test_inline_allowed_regions_check():
+    class DownloadInline(ContentEditorInline):
+        model = Download
+        regions = {"main", "sidebar"}
+
+    class DenyingDownloadInline(ContentEditorInline):
+        model = Download
+        regions = deny_regions({"main"})
+
+    class ValidDownloadInline(ContentEditorInline):
+        model = Download
+        # Unknown region keys are ignored
+        regions = {"main", "unknown"}
+
+    class ArticleAdmin(ContentEditor):
+        model = Article
+        inlines = [DownloadInline, DenyingDownloadInline, ValidDownloadInline]
+
+    assert ArticleAdmin(Article, admin.AdminSite()).check() == [
+        checks.Error(
+            "regions contains ['sidebar'] which aren't allowed by"
+            " testapp.Download.allowed_regions.",
+            obj=DownloadInline,
+            id="content_editor.E004",
+        ),
+        checks.Error(
+            "regions contains ['sidebar'] which aren't allowed by"
+            " testapp.Download.allowed_regions.",
+            obj=DenyingDownloadInline,
+            id="content_editor.E004",
+        ),
+    ]
+
+
 def test_plugin_base_checks():
     """Test that the check runs and doesn't error on existing models."""
     # Run the check on all existing models - should not raise an error
@@ -1,4 +1,9 @@
+import copy
+import json
+import pickle
+
 import pytest
+from bs4 import BeautifulSoup
 from django.contrib.auth.models import User
 from django.core.exceptions import ImproperlyConfigured
 from django.db import connection
@@ -6,8 +11,9 @@ from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from pytest_django.asserts import assertContains, assertNotContains
 
+from content_editor.admin import allow_regions, deny_regions
 from content_editor.contents import contents_for_item
-from content_editor.models import Region
+from content_editor.models import Region, plugin_regions
 from testapp.models import Article, Download, RichText
 
 
@@ -52,9 +58,7 @@ def test_stuff(client):
 
     # Test for Contents.__iter__
     contents = contents_for_item(article, plugins=[RichText, Download])
-    assert not contents._sorted
     assert len(list(contents)) == 2
-    assert contents._sorted
     assert len(list(contents)) == 2
 
     # Contents.__len__ also means that a Contents instance may be falsy
@@ -111,3 +115,66 @@ def test_invalid_region_objects():
 
 def test_hashable_types():
     _mapping = {Region(key="hello", title="Hello"): Region(key="world", title="World")}
+
+
+def test_region_type():
+    region = Region(key="main", title="Main", inherited=True, css_class="wide")
+    assert (region.key, region.title, region.inherited) == ("main", "Main", True)
+    assert region.css_class == "wide"
+    assert region["title"] == "Main"
+    assert region == Region(key="main", title="Main", inherited=True, css_class="wide")
+    assert region != Region(key="main", title="Main")
+    assert hash(region) == hash("main")
+    assert pickle.loads(pickle.dumps(region)) == region
+    assert copy.deepcopy(region) == region
+
+    # Regions are still dictionaries
+    data = {"key": "main", "title": "Main", "inherited": True, "css_class": "wide"}
+    assert region == data
+    assert dict(region) == data
+    assert json.loads(json.dumps(region)) == data
+    assert "css_class" in region
+    assert region.get("unknown") is None
+    assert len(region) == 4
+    assert list(region.keys()) == ["key", "title", "inherited", "css_class"]
+
+    with pytest.raises(AttributeError):
+        region.unknown  # noqa: B018
+    with pytest.raises(KeyError):
+        region["unknown"]
+    with pytest.raises(KeyError):
+        region[0]
+    with pytest.raises(AttributeError):
+        region.title = "Other"
+    with pytest.raises(TypeError):
+        region["title"] = "Other"
+    with pytest.raises(TypeError):
+        region.update(title="Other")
+    assert region.title == "Main"
+    assert not hasattr(region, "__dict__")
+
+
+@pytest.mark.django_db
+def test_admin_plugin_allowed_regions(client):
+    response = client.get(reverse("admin:testapp_article_add"))
+    soup = BeautifulSoup(response.content, "html.parser")
+    context = json.loads(soup.find(id="content-editor-context").string)
+    regions = {plugin["model"]: plugin["regions"] for plugin in context["plugins"]}
+    assert regions["testapp.richtext"] == ["main"]
+    assert regions["testapp.download"] == ["main"]
+    # Falls back to Teaser.allowed_regions
+    assert regions["testapp.teaser"] == ["sidebar"]
+    assert regions["testapp.section"] is None
+
+
+def test_plugin_regions():
+    class Plugin:
+        allowed_regions = None
+
+    assert plugin_regions(Plugin, {"main", "sidebar"}) is None
+
+    Plugin.allowed_regions = allow_regions({"main", "other"})
+    assert plugin_regions(Plugin, {"main", "sidebar"}) == {"main"}
+
+    Plugin.allowed_regions = deny_regions({"main"})
+    assert plugin_regions(Plugin, {"main", "sidebar"}) == {"sidebar"}
@@ -1,10 +1,34 @@
+import pickle
+from types import SimpleNamespace
+
 import pytest
 from django.db import connection
+from django.db.models import Value
 from django.test.utils import CaptureQueriesContext
 
-from content_editor.contents import Contents, contents_for_item
-from content_editor.models import Region
-from testapp.models import Article, Download, Page, PageText, RichText
+from content_editor.contents import (
+    Contents,
+    FrozenContents,
+    LazyContents,
+    PrefetchContents,
+    acontents_for_item,
+    acontents_for_items,
+    contents_for_item,
+    contents_for_items,
+    contents_for_tree,
+    iter_contents_for_items,
+)
+from content_editor.models import Region, registered_plugins
+from testapp.models import (
+    Article,
+    CloseSection,
+    Download,
+    Page,
+    PageText,
+    RichText,
+    Section,
+    Teaser,
+)
 
 
 @pytest.mark.django_db
@@ -84,3 +108,672 @@ def test_invalid_content_regions():
         _read = c._blub
     with pytest.raises(KeyError):
         c["_blub"]
+
+
+@pytest.mark.django_db
+def test_union_strategy():
+    article = Article.objects.create(title="Test")
+    plugins = [RichText, Download]
+
+    with CaptureQueriesContext(connection) as ctx:
+        contents = contents_for_item(article, plugins=plugins, strategy="union")
+        assert len(ctx.captured_queries) == 1
+    assert contents.main == []
+
+    RichText.objects.create(parent=article, region="main", ordering=20, text="Text")
+    RichText.objects.create(parent=article, region="sidebar", ordering=10, text="Side")
+    Download.objects.create(parent=article, region="main", ordering=10, file="a.pdf")
+    other = Article.objects.create(title="Other")
+    RichText.objects.create(parent=other, region="main", ordering=10, text="Other")
+
+    with CaptureQueriesContext(connection) as ctx:
+        contents = contents_for_item(article, plugins=plugins, strategy="union")
+        assert len(ctx.captured_queries) == 3
+        assert [str(c) for c in contents.main] == ["a.pdf", "Text"]
+        assert [str(c) for c in contents.sidebar] == ["Side"]
+        assert contents.main[1].parent == article
+        assert len(ctx.captured_queries) == 3
+
+    serial = contents_for_item(article, plugins=plugins)
+    assert list(contents) == list(serial)
+
+    with CaptureQueriesContext(connection) as ctx:
+        contents = contents_for_item(
+            article,
+            plugins=plugins,
+            regions=[Region(key="sidebar", title="sidebar")],
+            strategy="union",
+        )
+        # Download plugins cannot appear in the sidebar, no union query
+        assert len(ctx.captured_queries) == 1
+        assert [str(c) for c in contents] == ["Side"]
+
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError, match="Unknown strategy 'nope'"):
+        contents_for_item(Article(), plugins=[RichText], strategy="nope")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_threads_strategy():
+    article = Article.objects.create(title="Test")
+    RichText.objects.create(parent=article, region="main", ordering=20, text="Text")
+    Download.objects.create(parent=article, region="main", ordering=10, file="a.pdf")
+    plugins = [RichText, Download]
+
+    with CaptureQueriesContext(connection) as ctx:
+        contents = contents_for_item(article, plugins=plugins, strategy="threads")
+        # The queries ran on the connections of the worker threads
+        assert len(ctx.captured_queries) == 0
+    assert [str(c) for c in contents.main] == ["a.pdf", "Text"]
+    assert contents.main[0].parent is article
+
+
+@pytest.mark.django_db
+def test_threads_strategy_atomic():
+    article = Article.objects.create(title="Test")
+    RichText.objects.create(parent=article, region="main", ordering=20, text="Text")
+
+    with CaptureQueriesContext(connection) as ctx:
+        contents = contents_for_item(
+            article, plugins=[RichText, Download], strategy="threads"
+        )
+        assert len(ctx.captured_queries) == 2
+    assert [str(c) for c in contents.main] == ["Text"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_async():
+    page = await Page.objects.acreate(title="root")
+    child = await Page.objects.acreate(title="child", parent=page)
+    await PageText.objects.acreate(
+        parent=page, region="sidebar", ordering=10, text="page sidebar"
+    )
+    await PageText.objects.acreate(
+        parent=child, region="main", ordering=20, text="child main 2"
+    )
+    await PageText.objects.acreate(
+        parent=child, region="main", ordering=10, text="child main 1"
+    )
+
+    contents = await acontents_for_item(
+        child, plugins=[PageText], inherit_from=Page.objects.filter(pk=page.pk)
+    )
+    assert [c.text for c in contents.main] == ["child main 1", "child main 2"]
+    assert [c.text for c in contents.sidebar] == ["page sidebar"]
+    assert contents.sidebar[0].parent == page
+
+    contents = await acontents_for_item(
+        child,
+        plugins=[PageText],
+        inherit_from=[page],
+        regions=[Region(key="sidebar", title="sidebar", inherited=True)],
+    )
+    assert contents.main == []
+    assert [c.text for c in contents.sidebar] == ["page sidebar"]
+
+    all_contents = await acontents_for_items(
+        Page.objects.order_by("pk"), plugins=[PageText]
+    )
+    assert [(page.title, len(c)) for page, c in all_contents.items()] == [
+        ("root", 1),
+        ("child", 2),
+    ]
+
+
+@pytest.mark.django_db
+def test_pickle():
+    page = Page.objects.create(title="root")
+    child = page.children.create(title="child")
+    page.testapp_pagetext_set.create(region="sidebar", ordering=10, text="sidebar")
+    child.testapp_pagetext_set.create(region="main", ordering=20, text="main 2")
+    child.testapp_pagetext_set.create(region="main", ordering=10, text="main 1")
+    child.testapp_pagetext_set.create(region="unknown", ordering=10, text="unknown")
+
+    contents = contents_for_item(child, plugins=[PageText], inherit_from=[page])
+    contents.add(SimpleNamespace(region="unknown", ordering=20))
+
+    with CaptureQueriesContext(connection) as ctx:
+        restored = pickle.loads(pickle.dumps(contents))
+        assert [c.text for c in restored.main] == ["main 1", "main 2"]
+        assert [c.text for c in restored.sidebar] == ["sidebar"]
+        assert restored.main[0].parent == child
+        assert restored.main[0].parent is restored.main[1].parent
+        assert restored.sidebar[0].parent == page
+        assert len(ctx.captured_queries) == 0
+
+    assert restored.regions == child.regions
+    assert [c.text for c in restored._unknown_region_contents[:1]] == ["unknown"]
+    assert restored._unknown_region_contents[1] == SimpleNamespace(
+        region="unknown", ordering=20
+    )
+    assert not restored.main[0]._state.adding
+
+    deferred = PageText.objects.defer("text").get(text="main 1")
+    contents = Contents(child.regions)
+    contents.add(deferred)
+    restored = pickle.loads(pickle.dumps(contents))
+    assert restored.main[0].get_deferred_fields() == {"text"}
+    assert restored.main[0].pk == deferred.pk
+
+
+@pytest.mark.django_db
+def test_pickle_extra_state(monkeypatch):
+    root = Page.objects.create(title="root")
+    page = root.children.create(title="page")
+    page.testapp_pagetext_set.create(region="main", ordering=10, text="main")
+    page.testapp_pagetext_set.create(region="main", ordering=20, text="plain")
+
+    monkeypatch.setattr(
+        PageText,
+        "get_queryset",
+        classmethod(
+            lambda cls: cls.objects.annotate(extra=Value("hi")).select_related(
+                "parent__parent"
+            )
+        ),
+    )
+    contents = contents_for_item(Page.objects.get(pk=page.pk), plugins=[PageText])
+    # Related objects other than the parent and prefetched objects
+    contents.main[0]._state.fields_cache["other"] = root
+    contents.main[0]._prefetched_objects_cache = {"things": []}
+
+    with CaptureQueriesContext(connection) as ctx:
+        restored = pickle.loads(pickle.dumps(contents))
+        assert [c.extra for c in restored.main] == ["hi", "hi"]
+        assert restored.main[0]._state.fields_cache["other"] == root
+        assert restored.main[0]._prefetched_objects_cache == {"things": []}
+        # select_related() caches of the parent are kept as well
+        assert restored.main[0].parent == page
+        assert restored.main[1].parent.parent == root
+        assert len(ctx.captured_queries) == 0
+    assert not hasattr(restored.main[1], "_prefetched_objects_cache")
+
+
+@pytest.mark.django_db
+def test_lazy_contents():
+    article = Article.objects.create(title="Test")
+    RichText.objects.create(parent=article, region="main", ordering=20, text="main")
+    Download.objects.create(parent=article, region="main", ordering=10, file="a.pdf")
+    RichText.objects.create(parent=article, region="sidebar", text="sidebar")
+    RichText.objects.create(parent=article, region="unknown", text="unknown")
+
+    with CaptureQueriesContext(connection) as ctx:
+        contents = LazyContents(article, [RichText, Download])
+        assert len(ctx.captured_queries) == 0
+
+        assert [str(c) for c in contents.main] == ["a.pdf", "main"]
+        assert len(ctx.captured_queries) == 2
+        assert "sidebar" not in ctx.captured_queries[0]["sql"]
+        assert contents.main[0].parent is article
+
+        # Loaded regions and unknown region keys do not cause queries
+        assert len(contents["main"]) == 2
+        assert contents.nothing == []
+        assert len(ctx.captured_queries) == 2
+
+        # Download.allowed_regions doesn't contain the sidebar
+        assert [str(c) for c in contents] == ["a.pdf", "main", "sidebar"]
+        assert len(ctx.captured_queries) == 3
+        assert "main" not in ctx.captured_queries[2]["sql"]
+        # Like contents_for_item(regions=...), rows of unknown regions are skipped
+        assert contents._unknown_region_contents == []
+        assert len(contents) == 3
+        assert contents.sidebar[0].text == "sidebar"
+        assert len(ctx.captured_queries) == 3
+
+    restored = pickle.loads(pickle.dumps(LazyContents(article, [RichText])))
+    assert [str(c) for c in restored] == ["main", "sidebar"]
+    assert restored.main[0].text == "main"
+
+
+@pytest.mark.django_db
+def test_lazy_contents_regions():
+    article = Article.objects.create(title="Test")
+    RichText.objects.create(parent=article, region="main", text="main")
+    RichText.objects.create(parent=article, region="sidebar", text="sidebar")
+
+    contents = LazyContents(
+        article, [RichText], regions=[Region(key="sidebar", title="sidebar")]
+    )
+    assert contents.main == []
+    with CaptureQueriesContext(connection) as ctx:
+        assert [str(c) for c in contents] == ["sidebar"]
+        assert len(ctx.captured_queries) == 1
+        assert "main" not in ctx.captured_queries[0]["sql"]
+    assert contents._unknown_region_contents == []
+
+    # Nothing left to load once all regions have been accessed
+    contents = LazyContents(article, [RichText])
+    contents.main  # noqa: B018
+    contents.sidebar  # noqa: B018
+    with CaptureQueriesContext(connection) as ctx:
+        assert len(contents) == 2
+        assert len(ctx.captured_queries) == 0
+
+
+@pytest.mark.django_db
+def test_allowed_regions():
+    article = Article.objects.create(title="Test")
+    RichText.objects.create(parent=article, region="sidebar", text="sidebar")
+
+    # Download.allowed_regions doesn't contain the sidebar
+    with CaptureQueriesContext(connection) as ctx:
+        contents = contents_for_item(
+            article,
+            plugins=[RichText, Download],
+            regions=[Region(key="sidebar", title="sidebar")],
+        )
+        assert len(ctx.captured_queries) == 1
+    assert [str(c) for c in contents] == ["sidebar"]
+
+    with CaptureQueriesContext(connection) as ctx:
+        contents = LazyContents(article, plugins=[RichText, Download])
+        assert [str(c) for c in contents.sidebar] == ["sidebar"]
+        assert len(ctx.captured_queries) == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("strategy", ["serial", "union"])
+def test_sort(strategy):
+    article = Article.objects.create(title="Test")
+    other = Article.objects.create(title="Other")
+    for ordering in (30, 10, 50):
+        RichText.objects.create(
+            parent=article, region="main", ordering=ordering, text=f"text {ordering}"
+        )
+    for ordering in (40, 20, 10):
+        Download.objects.create(
+            parent=article, region="main", ordering=ordering, file=f"file {ordering}"
+        )
+    RichText.objects.create(parent=article, region="unknown", text="unknown")
+    RichText.objects.create(parent=other, region="sidebar", text="other")
+    expected = [
+        "text 10",
+        "file 10",
+        "file 20",
+        "text 30",
+        "file 40",
+        "text 50",
+    ]
+
+    with CaptureQueriesContext(connection) as ctx:
+        contents = contents_for_items(
+            [article, other],
+            plugins=[RichText, Download],
+            strategy=strategy,
+            sort="database",
+        )
+    assert all("ORDER BY" in query["sql"] for query in ctx.captured_queries[-2:])
+    assert not contents[article]._unsorted
+    assert [str(c) for c in contents[article]] == expected
+    assert [str(c) for c in contents[article]._unknown_region_contents] == ["unknown"]
+    assert [str(c) for c in contents[other]] == ["other"]
+    assert contents[other].sidebar[0].parent is other
+
+    with CaptureQueriesContext(connection) as ctx:
+        contents = contents_for_items(
+            [article, other],
+            plugins=[RichText, Download],
+            strategy=strategy,
+            sort="python",
+        )
+    assert all("ORDER BY" not in query["sql"] for query in ctx.captured_queries)
+    assert [str(c) for c in contents[article]] == expected
+
+    with pytest.raises(ValueError, match="Unknown sort 'nope'"):
+        contents_for_item(article, plugins=[RichText], sort="nope")
+
+
+def test_incremental_sorting():
+    c = Contents(
+        [Region(key="main", title="main"), Region(key="sidebar", title="sidebar")]
+    )
+    for region, ordering in [("main", 20), ("main", 10), ("sidebar", 20)]:
+        c.add(SimpleNamespace(region=region, ordering=ordering))
+    c.add(SimpleNamespace(region="sidebar", ordering=30))
+    assert c._unsorted == {"main"}
+
+    # Only the accessed region is sorted
+    c._contents["sidebar"].reverse()
+    assert [p.ordering for p in c.main] == [10, 20]
+    assert c._unsorted == set()
+    assert [p.ordering for p in c._contents["sidebar"]] == [30, 20]
+
+    # Plugins added after reading are inserted at the correct position
+    first = SimpleNamespace(region="main", ordering=15)
+    second = SimpleNamespace(region="main", ordering=15)
+    c.add(first)
+    c.add(second)
+    c.add(SimpleNamespace(region="main", ordering=5))
+    assert c._unsorted == set()
+    assert [p.ordering for p in c.main] == [5, 10, 15, 15, 20]
+    assert c.main[2] is first
+    assert c.main[3] is second
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("strategy", ["serial", "union"])
+def test_projections(strategy):
+    article = Article.objects.create(title="Test")
+    RichText.objects.create(parent=article, region="main", ordering=10, text="text")
+    Download.objects.create(parent=article, region="main", ordering=20, file="a.pdf")
+
+    with CaptureQueriesContext(connection) as ctx:
+        contents = contents_for_item(
+            article,
+            plugins=[RichText, Download],
+            strategy=strategy,
+            only={Download: ["id"]},
+            defer={RichText: ["text"]},
+        )
+        assert '"testapp_richtext"."text"' not in ctx.captured_queries[-2]["sql"]
+        assert '"testapp_download"."file"' not in ctx.captured_queries[-1]["sql"]
+
+    richtext, download = contents.main
+    assert richtext.get_deferred_fields() == {"text"}
+    assert download.get_deferred_fields() == {"file"}
+    assert download.region == "main"
+    assert download.ordering == 20
+    assert download.parent is article
+    assert len(ctx.captured_queries) == (2 if strategy == "serial" else 3)
+
+
+@pytest.mark.django_db
+def test_batches(settings):
+    articles = [Article.objects.create(title=f"Article {i}") for i in range(5)]
+    for article in articles:
+        RichText.objects.create(parent=article, region="main", text=article.title)
+
+    with CaptureQueriesContext(connection) as ctx:
+        contents = contents_for_items(
+            articles, plugins=[RichText, Download], batch_size=2
+        )
+        assert len(ctx.captured_queries) == 6
+    assert [c.main[0].text for c in contents.values()] == [
+        article.title for article in articles
+    ]
+
+    settings.CONTENT_EDITOR_BATCH_SIZE = 3
+    with CaptureQueriesContext(connection) as ctx:
+        contents_for_items(articles, plugins=[RichText, Download])
+        assert len(ctx.captured_queries) == 4
+
+    with CaptureQueriesContext(connection) as ctx:
+        pairs = iter_contents_for_items(
+            Article.objects.order_by("pk").iterator(chunk_size=2),
+            plugins=(plugin for plugin in [RichText, Download]),
+            batch_size=2,
+        )
+        article, contents = next(pairs)
+        # One query for the articles, two queries for the plugins
+        assert len(ctx.captured_queries) == 3
+        assert article == articles[0]
+        assert contents.main[0].text == "Article 0"
+
+        assert [(article.title, len(contents)) for article, contents in pairs] == [
+            ("Article 1", 1),
+            ("Article 2", 1),
+            ("Article 3", 1),
+            ("Article 4", 1),
+        ]
+
+
+@pytest.mark.django_db
+def test_queryset_subquery():
+    articles = [Article.objects.create(title=f"Article {i}") for i in range(3)]
+    for article in articles:
+        RichText.objects.create(parent=article, region="main", text=article.title)
+
+    with CaptureQueriesContext(connection) as ctx:
+        contents = contents_for_items(
+            Article.objects.exclude(title="Article 1"), plugins=[RichText, Download]
+        )
+        assert len(ctx.captured_queries) == 3
+        assert "IN (SELECT" in ctx.captured_queries[1]["sql"]
+        assert [(a.title, c.main[0].text) for a, c in contents.items()] == [
+            ("Article 0", "Article 0"),
+            ("Article 2", "Article 2"),
+        ]
+        assert contents[articles[0]].main[0].parent.title == "Article 0"
+        assert len(ctx.captured_queries) == 3
+
+    # Sliced querysets use a list of primary keys
+    with CaptureQueriesContext(connection) as ctx:
+        contents = contents_for_items(Article.objects.all()[:2], plugins=[RichText])
+        assert "IN (SELECT" not in ctx.captured_queries[1]["sql"]
+    assert len(contents) == 2
+
+    # Plugins of parents which aren't part of the evaluated items are skipped
+    queryset = Article.objects.all()
+    list(queryset)
+    article = Article.objects.create(title="New")
+    RichText.objects.create(parent=article, region="main", text="New")
+    contents = contents_for_items(queryset, plugins=[RichText], sort="database")
+    assert article not in contents
+    assert len(contents) == 3
+
+
+@pytest.mark.django_db
+def test_prefetch_contents():
+    articles = [Article.objects.create(title=f"Article {i}") for i in range(3)]
+    for article in articles[:2]:
+        RichText.objects.create(parent=article, region="main", text=article.title)
+    Download.objects.create(parent=articles[0], region="main", ordering=-1, file="f")
+
+    with CaptureQueriesContext(connection) as ctx:
+        result = list(
+            Article.objects.order_by("pk").prefetch_related(
+                PrefetchContents([RichText, Download])
+            )
+        )
+        assert len(ctx.captured_queries) == 3
+        assert [[str(c) for c in article.contents] for article in result] == [
+            ["f", "Article 0"],
+            ["Article 1"],
+            [],
+        ]
+        assert result[0].contents.main[0].parent is result[0]
+        assert len(ctx.captured_queries) == 3
+
+    with CaptureQueriesContext(connection) as ctx:
+        result = list(
+            Article.objects.order_by("pk")
+            .prefetch_related(
+                PrefetchContents(
+                    [RichText, Download],
+                    to_attr="sidebar_contents",
+                    regions=[Region(key="sidebar", title="sidebar")],
+                )
+            )
+            .iterator(chunk_size=2)
+        )
+        # One query for the articles, one query per chunk (downloads are not
+        # allowed in the sidebar)
+        assert len(ctx.captured_queries) == 3
+    assert [len(article.sidebar_contents) for article in result] == [0, 0, 0]
+
+    with pytest.raises(AttributeError):
+        articles[0]._content_editor_contents  # noqa: B018
+
+
+@pytest.mark.django_db
+def test_short_circuit_inheritance():
+    root = Page.objects.create(title="root")
+    page = root.children.create(title="page")
+    child = page.children.create(title="child")
+    root.testapp_pagetext_set.create(region="sidebar", text="root sidebar")
+    root.testapp_pagetext_set.create(region="main", text="root main")
+    ancestors = [page, root]
+
+    with CaptureQueriesContext(connection) as ctx:
+        contents = contents_for_item(
+            child, [PageText], inherit_from=ancestors, short_circuit=True
+        )
+        # The child and both ancestors
+        assert len(ctx.captured_queries) == 3
+        assert "main" not in ctx.captured_queries[1]["sql"]
+    assert contents.main == []
+    assert [c.text for c in contents.sidebar] == ["root sidebar"]
+    assert contents.sidebar[0].parent == root
+
+    page.testapp_pagetext_set.create(region="sidebar", text="page sidebar")
+    with CaptureQueriesContext(connection) as ctx:
+        contents = contents_for_item(
+            child, [PageText], inherit_from=iter(ancestors), short_circuit=True
+        )
+        # The root isn't queried anymore
+        assert len(ctx.captured_queries) == 2
+    assert [c.text for c in contents.sidebar] == ["page sidebar"]
+
+    child.testapp_pagetext_set.create(region="sidebar", text="child sidebar")
+    with CaptureQueriesContext(connection) as ctx:
+        contents = contents_for_item(
+            child, [PageText], inherit_from=ancestors, short_circuit=True
+        )
+        assert len(ctx.captured_queries) == 1
+    assert [c.text for c in contents.sidebar] == ["child sidebar"]
+
+
+@pytest.mark.django_db
+def test_contents_for_tree():
+    root = Page.objects.create(title="root")
+    page = root.children.create(title="page")
+    child = page.children.create(title="child")
+    sibling = page.children.create(title="sibling")
+    other = root.children.create(title="other")
+    root.testapp_pagetext_set.create(region="sidebar", text="root sidebar")
+    root.testapp_pagetext_set.create(region="main", text="root main")
+    other.testapp_pagetext_set.create(region="sidebar", text="other sidebar")
+
+    with CaptureQueriesContext(connection) as ctx:
+        # Children before parents do not matter
+        contents = contents_for_tree(
+            [child, sibling, other, page, root], plugins=[PageText]
+        )
+        assert len(ctx.captured_queries) == 1
+
+    assert [c.text for c in contents[child].sidebar] == ["root sidebar"]
+    assert contents[child].main == []
+    assert [c.text for c in contents[other].sidebar] == ["other sidebar"]
+    # Siblings share the inherited list
+    assert contents[child].sidebar is contents[sibling].sidebar
+    assert contents[child].sidebar is contents[root].sidebar
+
+    # Parents outside the set of nodes are ignored
+    contents = contents_for_tree([child], plugins=[PageText])
+    assert contents[child].sidebar == []
+
+
+@pytest.mark.django_db
+def test_registered_plugins():
+    assert registered_plugins(Article) == (
+        RichText,
+        Download,
+        Teaser,
+        Section,
+        CloseSection,
+    )
+    assert registered_plugins(Page) == (PageText,)
+
+    article = Article.objects.create(title="Test")
+    article.testapp_richtext_set.create(region="main", text="text")
+    article.testapp_download_set.create(region="main", file="file.pdf")
+
+    with CaptureQueriesContext(connection) as ctx:
+        contents = contents_for_item(article)
+        # One query per registered plugin
+        assert len(ctx.captured_queries) == 5
+    assert [c.__class__ for c in contents.main] == [RichText, Download]
+
+    contents = LazyContents(article)
+    assert len(contents) == 2
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("strategy", ["serial", "union", "threads", "index"])
+def test_records(strategy):
+    article = Article.objects.create(title="Test")
+    text = article.testapp_richtext_set.create(region="main", ordering=20, text="A")
+    download = article.testapp_download_set.create(
+        region="main", ordering=10, file="a.pdf"
+    )
+
+    contents = contents_for_item(
+        article, [RichText, Download], strategy=strategy, records=True
+    )
+    first, second = contents.main
+    assert first.plugin is Download
+    assert (first.pk, first.parent_id, first.file) == (download.pk, article.pk, "a.pdf")
+    assert second.plugin is RichText
+    assert second == (text.pk, "A", article.pk, "main", 20)
+    assert second._fields == ("id", "text", "parent_id", "region", "ordering")
+
+    restored = pickle.loads(pickle.dumps(contents))
+    assert restored.main == contents.main
+    assert restored.main[0].plugin is Download
+
+    contents = contents_for_items(
+        [article],
+        [RichText, Download],
+        strategy=strategy,
+        sort="database",
+        records=True,
+        only={Download: []},
+        defer={RichText: ["text"]},
+    )[article]
+    assert [record._fields for record in contents.main] == [
+        ("id", "parent_id", "region", "ordering"),
+        ("id", "parent_id", "region", "ordering"),
+    ]
+
+
+@pytest.mark.django_db
+def test_frozen_contents():
+    root = Page.objects.create(title="root")
+    page = root.children.create(title="page")
+    root.testapp_pagetext_set.create(region="sidebar", ordering=20, text="B")
+    root.testapp_pagetext_set.create(region="sidebar", ordering=10, text="A")
+    root.testapp_pagetext_set.create(region="main", text="root main")
+    page.testapp_pagetext_set.create(region="main", text="page main")
+    page.testapp_pagetext_set.create(region="unknown", text="unknown")
+
+    contents = contents_for_items([root, page], [PageText])
+    frozen_root = contents[root].freeze()
+    assert isinstance(frozen_root.sidebar, tuple)
+    assert [c.text for c in frozen_root.sidebar] == ["A", "B"]
+    assert [c.text for c in frozen_root] == ["root main", "A", "B"]
+    assert len(frozen_root) == 3
+    assert frozen_root["other"] == frozen_root.other == ()
+
+    frozen_page = contents[page].freeze()
+    inherited = frozen_page.inherit(frozen_root)
+    # Snapshots are composed, not modified or copied
+    assert frozen_page.sidebar == ()
+    assert inherited.sidebar is frozen_root.sidebar
+    assert inherited.main is frozen_page.main
+    assert [c.text for c in inherited._unknown_region_contents] == ["unknown"]
+
+    with pytest.raises(AttributeError):
+        inherited.main = ()
+    with pytest.raises(AttributeError):
+        inherited._invalid  # noqa: B018
+    with pytest.raises(AttributeError):
+        del inherited.regions
+    with pytest.raises(TypeError):
+        inherited._contents["main"] = ()
+
+    # Fresh contents may inherit regions from snapshots
+    fresh = contents_for_item(page, [PageText])
+    fresh.inherit_regions(frozen_root)
+    fresh.add(PageText(region="sidebar", ordering=30, text="C"))
+    assert [c.text for c in fresh.sidebar] == ["A", "B", "C"]
+    assert [c.text for c in frozen_root.sidebar] == ["A", "B"]
+
+    restored = pickle.loads(pickle.dumps(inherited))
+    assert isinstance(restored, FrozenContents)
+    assert [c.text for c in restored] == ["page main", "A", "B"]
+
+    lazy = LazyContents(root, [PageText]).freeze()
+    assert [c.text for c in lazy] == ["root main", "A", "B"]
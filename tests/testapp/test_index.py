@@ -0,0 +1,82 @@
+from io import StringIO
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from content_editor.contents import contents_for_item, contents_for_items
+from content_editor.index.models import ContentIndexEntry
+from testapp.models import Article, CloseSection, Download, RichText, Section
+
+
+PLUGINS = [RichText, Download, Section, CloseSection]
+
+
+@pytest.mark.django_db
+def test_index_signals():
+    article = Article.objects.create(title="Test")
+    richtext = article.testapp_richtext_set.create(region="main", ordering=10)
+    download = article.testapp_download_set.create(region="main", ordering=20)
+    assert ContentIndexEntry.objects.count() == 2
+
+    richtext.region = "sidebar"
+    richtext.save()
+    entry = ContentIndexEntry.objects.get(plugin_id=str(richtext.pk), ordering=10)
+    assert entry.region == "sidebar"
+    assert entry.parent_id == str(article.pk)
+
+    download.delete()
+    assert ContentIndexEntry.objects.count() == 1
+
+    article.delete()
+    assert ContentIndexEntry.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_index_strategy():
+    article = Article.objects.create(title="Test")
+    other = Article.objects.create(title="Other")
+    article.testapp_richtext_set.create(region="main", ordering=20, text="text")
+    article.testapp_download_set.create(region="main", ordering=10, file="a.pdf")
+    other.testapp_section_set.create(region="main")
+    # Content types are cached after the first lookup
+    ContentType.objects.get_for_models(Article, *PLUGINS)
+
+    with CaptureQueriesContext(connection) as ctx:
+        contents = contents_for_item(article, PLUGINS, strategy="index")
+        # The index and the two plugin tables which occur
+        assert len(ctx.captured_queries) == 3
+    assert [c.__class__ for c in contents.main] == [Download, RichText]
+    assert contents.main[0].parent is article
+
+    with CaptureQueriesContext(connection) as ctx:
+        contents = contents_for_items([other], PLUGINS, strategy="index")
+        assert len(ctx.captured_queries) == 2
+    assert [c.__class__ for c in contents[other].main] == [Section]
+
+
+@pytest.mark.django_db
+def test_rebuild_content_index():
+    article = Article.objects.create(title="Test")
+    RichText.objects.bulk_create(
+        [RichText(parent=article, region="main", ordering=index) for index in range(5)]
+    )
+    article.testapp_download_set.create(region="main")
+    assert ContentIndexEntry.objects.count() == 1
+
+    out = StringIO()
+    call_command("rebuild_content_index", "testapp.RichText", stdout=out)
+    assert "Indexed 5 plugins of 1 plugin models." in out.getvalue()
+    assert ContentIndexEntry.objects.count() == 6
+
+    call_command("rebuild_content_index", stdout=out)
+    assert ContentIndexEntry.objects.count() == 6
+    contents = contents_for_item(article, PLUGINS, strategy="index")
+    assert len(contents.main) == 6
+
+    with pytest.raises(CommandError):
+        call_command("rebuild_content_index", "testapp.Article")
+    with pytest.raises(CommandError):
+        call_command("rebuild_content_index", "testapp.Unknown")
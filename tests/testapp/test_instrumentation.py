@@ -0,0 +1,85 @@
+import pytest
+
+from content_editor.contents import contents_for_item, contents_for_items
+from content_editor.instrumentation import MemoryCollector, _current_call
+from testapp.models import Article, Download, Page, PageText, RichText
+
+
+@pytest.mark.django_db
+def test_memory_collector():
+    article = Article.objects.create(title="Test")
+    article.testapp_richtext_set.create(region="main")
+    article.testapp_richtext_set.create(region="sidebar")
+    other = Article.objects.create(title="Other")
+
+    with MemoryCollector() as collector:
+        contents_for_items([article, other], [RichText, Download], batch_size=1)
+        contents_for_items(Article.objects.all(), [RichText], strategy="union")
+
+    # Nothing is recorded outside the collector
+    contents_for_items([article], [RichText, Download])
+    assert _current_call.get() is None
+
+    first, second = collector.calls
+    assert first.function == "contents_for_items"
+    assert first.items == 2
+    # Two batches with two plugin queries each
+    assert first.num_queries == 4
+    assert first.rows == {"testapp.RichText": 2, "testapp.Download": 0}
+    assert first.duration >= sum(query.duration for query in first.queries)
+    assert second.items == 2
+    assert second.rows == {"testapp.RichText": 2}
+
+    assert collector.percentiles("items") == {50: 2, 90: 2, 99: 2}
+    assert collector.percentiles("num_queries", (50, 100)) == {50: 1, 100: 4}
+    assert collector.percentiles(function="contents_for_item") == {}
+
+
+@pytest.mark.django_db
+def test_inheritance_depth():
+    root = Page.objects.create(title="root")
+    page = root.children.create(title="page")
+    child = page.children.create(title="child")
+    root.testapp_pagetext_set.create(region="sidebar")
+
+    with MemoryCollector() as collector:
+        contents_for_item(child, [PageText], inherit_from=[page, root])
+        contents_for_item(
+            child, [PageText], inherit_from=[page, root], short_circuit=True
+        )
+        contents_for_item(root, [PageText], inherit_from=[], short_circuit=True)
+
+    # Nested calls of contents_for_items are a part of the outer call
+    assert [call.function for call in collector.calls] == ["contents_for_item"] * 3
+    assert [call.inheritance_depth for call in collector.calls] == [2, 2, 0]
+    assert [call.num_queries for call in collector.calls] == [1, 3, 1]
+    assert [call.items for call in collector.calls] == [3, 3, 1]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("records", [False, True])
+@pytest.mark.parametrize("strategy", ["serial", "union", "threads", "index"])
+def test_strategies(strategy, records):
+    article = Article.objects.create(title="Test")
+    article.testapp_richtext_set.create(region="main")
+    article.testapp_richtext_set.create(region="sidebar")
+
+    with MemoryCollector() as collector:
+        contents = contents_for_items(
+            [article], [RichText, Download], strategy=strategy, records=records
+        )
+    assert len(contents[article].main) == 1
+
+    (call,) = collector.calls
+    rows = {
+        "serial": {"testapp.RichText": 2, "testapp.Download": 0},
+        "threads": {"testapp.RichText": 2, "testapp.Download": 0},
+        # The skeleton and index queries determine the existing plugin rows,
+        # empty plugin tables are skipped
+        "union": {None: 2, "testapp.RichText": 2},
+        "index": {"content_editor_index.ContentIndexEntry": 2, "testapp.RichText": 2},
+    }[strategy]
+    assert call.rows == rows
+    assert call.num_queries == len(rows)
+    # Queries of the threads strategy are timed in the worker threads
+    assert all(query.duration > 0 for query in call.queries)
@@ -0,0 +1,234 @@
+from itertools import chain
+from unittest import mock
+
+import pytest
+from django.core.cache import cache, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.http import StreamingHttpResponse
+from django.template import Context, RequestContext
+from django.utils.html import format_html, mark_safe
+from django.utils.safestring import SafeString
+
+from content_editor.caching import _version_timeout, _versions
+from content_editor.contents import contents_for_item
+from content_editor.renderer import CachedRenderer, PluginRenderer
+from testapp.models import AbstractRichText, Article, Download, RichText
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def render(plugin, context):
+    render.calls += 1
+    if isinstance(plugin, RichText):
+        return plugin.text
+    return format_html("<a href='{}'>{}</a>", plugin.file, context)
+
+
+render.calls = 0
+
+
+@pytest.mark.django_db
+def test_cached_renderer():
+    article = Article.objects.create(title="Test")
+    text = article.testapp_richtext_set.create(region="main", ordering=10, text="A")
+    article.testapp_download_set.create(region="main", ordering=20, file="a.pdf")
+    renderer = CachedRenderer(render)
+    render.calls = 0
+
+    contents = contents_for_item(article, [RichText, Download])
+    assert renderer.render_region(contents, "main", "de", context_key="de") == (
+        "A<a href='a.pdf'>de</a>"
+    )
+    assert render.calls == 2
+    assert renderer.render_region(contents, "main", "de", context_key="de") == (
+        "A<a href='a.pdf'>de</a>"
+    )
+    assert render.calls == 2
+    assert renderer.render_region(contents, "sidebar") == ""
+
+    # Fragments are reused in other contexts
+    assert renderer.render_plugin(text, "en", context_key="de") == "A"
+    assert renderer.render_plugins(contents.main, "en", context_key="en") == [
+        "A",
+        "<a href='a.pdf'>en</a>",
+    ]
+    assert render.calls == 4
+    assert renderer.stats == {
+        "hits": 1,
+        "misses": 4,
+        "region_hits": 1,
+        "region_misses": 1,
+    }
+
+    # Saving plugins invalidates their fragments and the region
+    text.text = "B"
+    text.save()
+    contents = contents_for_item(article, [RichText, Download])
+    assert renderer.render_region(contents, "main", "de", context_key="de") == (
+        "B<a href='a.pdf'>de</a>"
+    )
+    assert render.calls == 5
+    assert renderer.stats["region_misses"] == 2
+
+
+@pytest.mark.django_db
+def test_cached_renderer_escaping():
+    article = Article.objects.create(title="Test")
+    text = article.testapp_richtext_set.create(
+        region="main", ordering=10, text="<script>"
+    )
+    renderer = CachedRenderer(lambda plugin, context: plugin.text)
+    contents = contents_for_item(article, [RichText])
+
+    for _ in range(2):
+        # Cached fragments and regions are escaped as well
+        assert renderer.render_plugin(text) == "&lt;script&gt;"
+        assert isinstance(renderer.render_plugin(text), SafeString)
+        assert renderer.render_region(contents, "main") == "&lt;script&gt;"
+    assert renderer.stats == {
+        "hits": 4,
+        "misses": 1,
+        "region_hits": 1,
+        "region_misses": 1,
+    }
+
+
+def test_version_timeout(settings):
+    article, text = Article(pk=1), RichText(pk=1)
+    settings.CONTENT_EDITOR_VERSION_TIMEOUT = 3600
+
+    assert _version_timeout() == 3600
+    assert _version_timeout(DEFAULT_TIMEOUT) == 3600
+    assert _version_timeout(None) == 3600
+    assert _version_timeout(7200) == 14400
+
+    # All missing versions are initialized using a single cache operation
+    backend = caches["default"]
+    with (
+        mock.patch.object(backend, "set_many", wraps=backend.set_many) as set_many,
+        mock.patch.object(backend, "add", wraps=backend.add) as add,
+    ):
+        versions = _versions(backend, [article, text], 60)
+    assert add.call_count == 0
+    assert set_many.call_count == 1
+    assert set_many.call_args.args[1] == 3600
+    assert versions == _versions(backend, [article, text])
+
+
+@pytest.mark.django_db
+def test_plugin_renderer():
+    article = Article.objects.create(title="Test")
+    article.testapp_richtext_set.create(region="main", ordering=10, text="<p>A</p>")
+    article.testapp_download_set.create(region="main", ordering=20, file="a.pdf")
+    article.testapp_download_set.create(region="sidebar", file="b.pdf")
+    contents = contents_for_item(article, [RichText, Download])
+
+    renderer = PluginRenderer()
+    # Resolved using the MRO
+    renderer.register(AbstractRichText, lambda plugin, context: mark_safe(plugin.text))
+    renderer.register(Download, "testapp/plugins/download.html")
+
+    assert renderer.render_contents(contents, {"title": "Download"}) == {
+        "main": '<p>A</p><a href="a.pdf">Download</a>\n',
+        "sidebar": '<a href="b.pdf">Download</a>\n',
+    }
+    assert renderer.render_region(contents, "sidebar") == '<a href="b.pdf">b.pdf</a>\n'
+    assert renderer._resolved.keys() == {RichText, Download}
+    assert renderer._templates.keys() == {"testapp/plugins/download.html"}
+
+    with pytest.raises(KeyError):
+        renderer.render_plugin(article)
+
+    # Renderers can be used with the cached renderer
+    assert CachedRenderer(renderer).render_region(contents, "main") == (
+        '<p>A</p><a href="a.pdf">a.pdf</a>\n'
+    )
+
+
+@pytest.mark.django_db
+def test_plugin_renderer_escaping():
+    article = Article.objects.create(title="Test")
+    article.testapp_richtext_set.create(region="main", ordering=10, text="<script>")
+    article.testapp_download_set.create(region="main", ordering=20, file="a.pdf")
+    contents = contents_for_item(article, [RichText, Download])
+
+    renderer = PluginRenderer()
+    renderer.register(RichText, lambda plugin, context: plugin.text)
+    renderer.register(Download, "testapp/plugins/download.html")
+
+    # Only output which isn't marked safe is escaped
+    html = renderer.render_region(contents, "main")
+    assert html == '&lt;script&gt;<a href="a.pdf">a.pdf</a>\n'
+    assert isinstance(html, SafeString)
+    assert list(renderer.stream_contents(contents))[0] == "&lt;script&gt;"
+    assert renderer.render_plugin(contents.main[0]) == "&lt;script&gt;"
+
+
+@pytest.mark.django_db
+def test_plugin_renderer_template_context(rf):
+    article = Article.objects.create(title="Test")
+    article.testapp_download_set.create(region="main", file="a.pdf")
+    contents = contents_for_item(article, [Download])
+
+    renderer = PluginRenderer()
+    renderer.register(Download, "testapp/plugins/download.html")
+
+    # Contexts passed by template tags are flattened
+    assert renderer.render_region(contents, "main", Context({"title": "D"})) == (
+        '<a href="a.pdf">D</a>\n'
+    )
+    context = RequestContext(rf.get("/"), {"title": "R"})
+    assert renderer.render_region(contents, "main", context) == (
+        '<a href="a.pdf">R</a>\n'
+    )
+
+
+@pytest.mark.django_db
+def test_render_records():
+    article = Article.objects.create(title="Test")
+    text = article.testapp_richtext_set.create(region="main", ordering=10, text="A")
+    article.testapp_download_set.create(region="main", ordering=20, file="a.pdf")
+    contents = contents_for_item(article, [RichText, Download], records=True)
+
+    renderer = PluginRenderer()
+    renderer.register(AbstractRichText, lambda plugin, context: mark_safe(plugin.text))
+    renderer.register(Download, "testapp/plugins/download.html")
+    assert renderer.render_region(contents, "main") == 'A<a href="a.pdf">a.pdf</a>\n'
+
+    cached = CachedRenderer(renderer)
+    assert cached.render_region(contents, "main") == 'A<a href="a.pdf">a.pdf</a>\n'
+    # Records share the fragments and versions of their plugin instances
+    assert cached.render_plugin(text) == "A"
+    assert cached.stats["hits"] == 1
+
+    text.text = "B"
+    text.save()
+    contents = contents_for_item(article, [RichText, Download], records=True)
+    assert cached.render_region(contents, "main") == 'B<a href="a.pdf">a.pdf</a>\n'
+
+
+@pytest.mark.django_db
+def test_stream_contents():
+    article = Article.objects.create(title="Test")
+    article.testapp_richtext_set.create(region="sidebar", text="<p>S</p>")
+    article.testapp_richtext_set.create(region="main", ordering=20, text="<p>B</p>")
+    article.testapp_richtext_set.create(region="main", ordering=10, text="<p>A</p>")
+    contents = contents_for_item(article, [RichText])
+
+    renderer = PluginRenderer()
+    renderer.register(RichText, lambda plugin, context: mark_safe(plugin.text))
+
+    stream = renderer.stream_contents(contents)
+    assert next(stream) == "<p>A</p>"
+
+    response = StreamingHttpResponse(
+        chain(["<main>"], renderer.stream_contents(contents), ["</main>"])
+    )
+    assert b"".join(response.streaming_content) == (
+        b"<main><p>A</p><p>B</p><p>S</p></main>"
+    )
@@ -2,6 +2,7 @@ from django.utils.html import format_html, mark_safe
 from django.views import generic
 
 from content_editor.contents import contents_for_item
+from content_editor.renderer import PluginRenderer
 from testapp.models import (
     AbstractRichText,
     Article,
@@ -12,12 +13,14 @@ from testapp.models import (
 )
 
 
-def render_items(items):
-    for item in items:
-        if isinstance(item, AbstractRichText):
-            yield mark_safe(item.text)
-        elif isinstance(item, Download):
-            yield format_html('<a href="{}">{}</a>', item.file, item.file)
+renderer = PluginRenderer()
+renderer.register(AbstractRichText, lambda plugin, context: mark_safe(plugin.text))
+renderer.register(
+    Download,
+    lambda plugin, context: format_html(
+        '<a href="{}">{}</a>', plugin.file, plugin.file
+    ),
+)
 
 
 class ArticleView(generic.DetailView):
@@ -27,11 +30,7 @@ class ArticleView(generic.DetailView):
         contents = contents_for_item(self.object, [RichText, Download])
 
         return super().get_context_data(
-            content={
-                region.key: mark_safe("".join(render_items(contents[region.key])))
-                for region in self.object.regions
-            },
-            **kwargs,
+            content=renderer.render_contents(contents), **kwargs
         )
 
 
@@ -43,9 +42,5 @@ class PageView(generic.DetailView):
             self.object, [PageText], inherit_from=filter(None, [self.object.parent])
         )
         return super().get_context_data(
-            content={
-                region.key: mark_safe("".join(render_items(contents[region.key])))
-                for region in self.object.regions
-            },
-            **kwargs,
+            content=renderer.render_contents(contents), **kwargs
         )